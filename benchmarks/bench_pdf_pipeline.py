@@ -0,0 +1,159 @@
+"""
+End-to-end benchmark of the PDF reports, against the local stand-in render
+server (benchmarks/pdf_render_server.py, started in this process).
+
+For reports of 1, 10 and 50 pages, measures generate_dashboard_pdf_file()
+(render, merge) and the scheduled sending (cron_send_scheduled_reports: render,
+attachment, queued emails): throughput, median and p95 duration, and the peak
+of Python memory allocated (tracemalloc) during a run, measured by a separate
+untimed run.
+
+    python benchmarks/bench_pdf_pipeline.py -c odoo.conf -d DATABASE [--pages 1,10,50]
+        [--runs 5] [--latency 500] [--jitter 200] [--failure-rate 0] [--page-size 200]
+        [--concurrency 4] [--cache]
+
+Needs Odoo and a database with odashboard installed. The cron commits, so use a
+disposable copy of a database: the pages, reports, attachments and emails
+created by the benchmark are removed at the end, the system parameters
+restored.
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from pdf_render_server import start_server
+
+PARAMETERS = ('odashboard.pdf.url', 'odashboard.pdf.concurrency', 'odashboard.pdf.cache_window')
+
+
+def measure(function, runs):
+    """
+    Call `function` `runs` times, return (durations in s, peak allocated bytes).
+    tracemalloc slows down every allocation, so the timed runs are run without
+    it and the peak is measured by one more, untimed, run.
+    """
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return durations, peak
+
+
+def report_line(label, pages, durations, peak):
+    p95 = statistics.quantiles(durations, n=20, method='inclusive')[18] if len(durations) > 1 else durations[0]
+    throughput = pages * len(durations) / sum(durations)
+    return (f"  {label:<10} {pages:>3} pages  {throughput:7.2f} pages/s  "
+            f"median {statistics.median(durations):7.2f} s  p95 {p95:7.2f} s  peak {peak / 1024 / 1024:8.1f} MiB")
+
+
+def create_pages(env, count):
+    return env['odash.config'].create([{
+        'is_page_config': True,
+        'config_id': f'bench-page-{index}',
+        'config': {'id': f'bench-page-{index}', 'title': f'Benchmark page {index + 1}'},
+    } for index in range(count)])
+
+
+def create_report(env, pages):
+    return env['odash.pdf.report'].create({
+        'name': f'Benchmark {len(pages)} pages',
+        'period': 'daily',
+        'page_ids': [(6, 0, pages.ids)],
+        'recipient_emails': 'benchmark@example.com',
+    })
+
+
+def run(env, args, server_url):
+    Param = env['ir.config_parameter'].sudo()
+    previous = {name: Param.get_param(name) for name in PARAMETERS}
+    Param.set_param('odashboard.pdf.url', server_url)
+    Param.set_param('odashboard.pdf.concurrency', str(args.concurrency))
+    Param.set_param('odashboard.pdf.cache_window', '3600' if args.cache else '0')
+
+    page_counts = [int(count) for count in args.pages.split(',')]
+    pages = create_pages(env, max(page_counts))
+    reports = env['odash.pdf.report'].browse()
+    env.cr.commit()
+    try:
+        generator = env['odash.pdf.generator']
+        print("generate_dashboard_pdf_file")
+        for count in page_counts:
+            report = create_report(env, pages[:count])
+            reports |= report
+
+            def generate():
+                with generator.generate_dashboard_pdf_file(report):
+                    pass
+
+            print(report_line('generate', count, *measure(generate, args.runs)))
+
+        print("cron_send_scheduled_reports")
+        Report = env['odash.pdf.report']
+        for report in reports:
+            count = len(report.page_ids)
+
+            def send():
+                # Make the report due again, for a schedule date not sent yet
+                env['odash.pdf.report.job'].search([('report_id', '=', report.id)]).unlink()
+                report.write({'last_sent_date': datetime.now() - timedelta(days=2)})
+                env.cr.commit()
+                Report.cron_send_scheduled_reports()
+
+            print(report_line('cron', count, *measure(send, args.runs)))
+    finally:
+        env.cr.rollback()
+        env['mail.mail'].search([('model', '=', 'odash.pdf.report'), ('res_id', 'in', reports.ids)]).unlink()
+        reports.unlink()
+        pages.unlink()
+        for name, value in previous.items():
+            Param.set_param(name, value or False)
+        env.cr.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-c', '--config', help="Odoo configuration file")
+    parser.add_argument('-d', '--database', required=True)
+    parser.add_argument('--pages', default='1,10,50', help="page counts of the reports")
+    parser.add_argument('--runs', type=int, default=5, help="runs per measure")
+    parser.add_argument('--port', type=int, default=8079, help="port of the render server")
+    parser.add_argument('--latency', type=float, default=500, help="mean render time, in ms")
+    parser.add_argument('--jitter', type=float, default=200, help="standard deviation of the render time, in ms")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="share of the renders answering an error")
+    parser.add_argument('--page-size', type=int, default=200, help="size of each rendered page, in KiB")
+    parser.add_argument('--concurrency', type=int, default=4, help="odashboard.pdf.concurrency")
+    parser.add_argument('--cache', action='store_true', help="keep the render cache enabled")
+    args = parser.parse_args()
+
+    import odoo
+    from odoo import api, SUPERUSER_ID
+    from odoo.modules.registry import Registry
+
+    odoo.tools.config.parse_config([*(['-c', args.config] if args.config else []), '-d', args.database])
+    server = start_server(port=args.port, latency=args.latency, jitter=args.jitter,
+                          failure_rate=args.failure_rate, page_size=args.page_size)
+    print(f"Render server: {args.latency:.0f}±{args.jitter:.0f} ms, {args.failure_rate:.0%} failures, "
+          f"{len(server.pdf) / 1024:.0f} KiB per page, concurrency {args.concurrency}, "
+          f"cache {'on' if args.cache else 'off'}")
+    try:
+        with Registry(args.database).cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            run(env, args, f"http://localhost:{args.port}")
+    finally:
+        server.shutdown()
+        server.server_close()
+    print(f"Rendered {server.rendered}, failed {server.failed}")
+
+
+if __name__ == '__main__':
+    main()
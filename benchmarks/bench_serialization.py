@@ -0,0 +1,102 @@
+"""
+Micro-benchmark of the JSON serialization of dashboard responses.
+
+Compares the previous encoder (stdlib json.dumps with a Python `default`
+callback) with odashboard/tools/serialization.py (orjson when installed),
+and the cost and ratio of the response compression.
+
+    python benchmarks/bench_serialization.py [--rows 20000] [--repeat 5]
+
+Runs without Odoo: the tools module is loaded directly from its file.
+"""
+import argparse
+import importlib.util
+import json
+import random
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+TOOLS = Path(__file__).resolve().parent.parent / 'odashboard' / 'tools'
+
+
+def load_serialization():
+    spec = importlib.util.spec_from_file_location('odash_serialization', TOOLS / 'serialization.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_dumps(value):
+    """Encoder used by the controllers before the shared serialization path."""
+    def default_converter(o):
+        if isinstance(o, (datetime, date)):
+            return o.isoformat()
+        return str(o)
+    return json.dumps(value, default=default_converter).encode('utf-8')
+
+
+def table_payload(rows):
+    """A table widget: one dict per record, with dates, amounts, many2one pairs and text."""
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    return [{
+        'id': index,
+        'name': f'INV/2024/{index:06d}',
+        'date': (start + timedelta(days=index % 365)).date(),
+        'create_date': start + timedelta(minutes=index),
+        'partner_id': [rng.randint(1, 5000), f'Partner {rng.randint(1, 5000)}'],
+        'amount_total': round(rng.uniform(10, 100000), 2),
+        'state': rng.choice(['draft', 'posted', 'cancel']),
+        'note': 'Lorem ipsum dolor sit amet ' * rng.randint(0, 4),
+    } for index in range(rows)]
+
+
+def graph_payload(series, points):
+    """A graph widget: a few series of (label, value) points."""
+    rng = random.Random(7)
+    return [{
+        'label': f'Series {serie}',
+        'data': [{'x': f'2024-{point % 12 + 1:02d}', 'y': rng.uniform(0, 1e6)} for point in range(points)],
+    } for serie in range(series)]
+
+
+def bench(function, value, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(value)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000, help="rows of the table payload")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per measure, the best is kept")
+    args = parser.parse_args()
+
+    serialization = load_serialization()
+    print(f"orjson: {'yes' if serialization.orjson else 'no'}, brotli: {'yes' if serialization.brotli else 'no'}")
+
+    payloads = {
+        'table': table_payload(args.rows),
+        'graph': graph_payload(10, 500),
+        'block': {'value': 123456.78, 'label': 'Revenue', 'date': date(2024, 6, 30)},
+    }
+    for name, payload in payloads.items():
+        legacy_time, legacy_body = bench(legacy_dumps, payload, args.repeat)
+        new_time, new_body = bench(serialization.json_dumps, payload, args.repeat)
+        assert json.loads(legacy_body) == json.loads(new_body), f"{name}: encoders disagree"
+        print(f"\n{name}: {len(legacy_body) / 1024:.1f} KiB")
+        print(f"  json.dumps + default  {legacy_time * 1000:9.2f} ms")
+        print(f"  json_dumps            {new_time * 1000:9.2f} ms  (x{legacy_time / new_time:.1f})")
+        for encoding in serialization.compression_encodings():
+            compress_time, compressed = bench(lambda body: serialization.compress(body, encoding), new_body, args.repeat)
+            print(f"  {encoding:<6} compression   {compress_time * 1000:9.2f} ms  "
+                  f"{len(compressed) / 1024:.1f} KiB ({len(compressed) / len(new_body):.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""
+Local stand-in for the PDF render server (odashboard.pdf.url).
+
+Speaks the same contract as the real service: POST /render with a JSON body
+{"url": ...} answers the PDF of the page (application/pdf), or an error as
+JSON. Instead of rendering the URL, it answers a generated PDF after a
+configurable latency, with configurable failures and sizes, so that the PDF
+paths of the module can be measured offline.
+
+    python benchmarks/pdf_render_server.py [--port 8079] [--latency 500] [--jitter 200]
+        [--failure-rate 0.05] [--page-size 200] [--pages 1]
+
+then set the system parameter odashboard.pdf.url to http://localhost:8079.
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_pdf(pages=1, page_size=200, seed=None):
+    """
+    Return a valid PDF of `pages` A4 pages, each one padded to about `page_size`
+    KiB with incompressible data (as rendered charts would be).
+    """
+    rng = random.Random(seed)
+    objects = {1: b"<< /Type /Catalog /Pages 2 0 R >>"}
+    kids = []
+    for index in range(pages):
+        page_id, content_id = 3 + 2 * index, 4 + 2 * index
+        kids.append(f"{page_id} 0 R")
+        text = f"BT /F1 24 Tf 72 770 Td (O'Dashboard page {index + 1}) Tj ET\n".encode()
+        # Comments are ignored by PDF readers, but fill the content stream
+        padding = rng.randbytes(page_size * 1024).hex().encode()
+        stream = text + b"%" + padding + b"\n"
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents {content_id} 0 R "
+            f"/Resources << /Font << /F1 << /Type /Font /Subtype /Type1 /BaseFont /Helvetica >> >> >> >>"
+        ).encode()
+        objects[content_id] = b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"endstream"
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>".encode()
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = len(output)
+        output += b"%d 0 obj\n" % object_id + objects[object_id] + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for object_id in sorted(objects):
+        output += b"%010d 00000 n \n" % offsets[object_id]
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(output)
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    """Handler of the render requests, configured by the attributes of its server."""
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok', 'rendered': self.server.rendered, 'failed': self.server.failed})
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        if self.path != '/render':
+            self._send_json(404, {'error': 'Not found'})
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)))
+            url = payload['url']
+        except (ValueError, KeyError, TypeError):
+            self._send_json(400, {'error': 'Expected a JSON body {"url": ...}'})
+            return
+
+        server = self.server
+        delay = max(0.0, random.gauss(server.latency, server.jitter)) / 1000
+        time.sleep(delay)
+        if random.random() < server.failure_rate:
+            with server.lock:
+                server.failed += 1
+            self._send_json(500, {'error': 'Rendering failed', 'detail': f'Simulated failure for {url}'})
+            return
+
+        body = server.pdf
+        with server.lock:
+            server.rendered += 1
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/pdf')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(host='localhost', port=8079, latency=500, jitter=200, failure_rate=0.0,
+                page_size=200, pages=1, verbose=False):
+    """
+    Return the render server, not started: latency and jitter in ms, failure_rate
+    between 0 and 1, page_size in KiB, `pages` pages per rendered PDF.
+    """
+    server = ThreadingHTTPServer((host, port), RenderHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.jitter = jitter
+    server.failure_rate = failure_rate
+    server.pdf = make_pdf(pages, page_size, seed=os.getpid())
+    server.verbose = verbose
+    server.lock = threading.Lock()
+    server.rendered = server.failed = 0
+    return server
+
+
+def start_server(**options):
+    """Start a render server in a background thread, return it (stop it with shutdown())."""
+    server = make_server(**options)
+    threading.Thread(target=server.serve_forever, name='pdf_render_server', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8079)
+    parser.add_argument('--latency', type=float, default=500, help="mean render time, in ms")
+    parser.add_argument('--jitter', type=float, default=200, help="standard deviation of the render time, in ms")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="share of the renders answering an error")
+    parser.add_argument('--page-size', type=int, default=200, help="size of each PDF page, in KiB")
+    parser.add_argument('--pages', type=int, default=1, help="pages per rendered PDF")
+    parser.add_argument('--verbose', action='store_true', help="log every request")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.latency, args.jitter, args.failure_rate,
+                         args.page_size, args.pages, args.verbose)
+    print(f"PDF render server on http://{args.host}:{args.port} "
+          f"({len(server.pdf) / 1024:.0f} KiB per PDF, {args.latency:.0f}±{args.jitter:.0f} ms, "
+          f"{args.failure_rate:.0%} failures)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
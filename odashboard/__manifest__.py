@@ -26,6 +26,7 @@ No coding required - just install and start building!
     'website': 'https://odashboard.app',
     'depends': [
         'base',
+        'bus',
         'web',
         'mail',
     ],
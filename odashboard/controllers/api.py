@@ -3,21 +3,17 @@ import logging
 import hmac
 import hashlib
 import time
-from datetime import datetime, date
 
 from odoo import http, _
-from odoo.http import request, Response
+from odoo.exceptions import AccessError, UserError
+from odoo.http import request
 
 from .api_helper import ApiHelper
 
 _logger = logging.getLogger(__name__)
 
-
-class OdashboardJSONEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, (datetime, date)):
-            return obj.isoformat()
-        return super(OdashboardJSONEncoder, self).default(obj)
+# Maximum number of actions accepted by one /api/odash/execute/batch call
+BATCH_MAX_ITEMS = 100
 
 
 class OdashboardAPI(http.Controller):
@@ -161,6 +157,9 @@ class OdashboardAPI(http.Controller):
             if not action:
                 return ApiHelper.json_error_response(_("Missing 'action' parameter"), 400)
             
+            if action == 'get_model_records' and ApiHelper.is_stream_requested(parameters):
+                return self._stream_model_records(parameters.get('model_name'), parameters)
+
             # Get engine instance
             engine = request.env['odash.engine'].sudo()._get_single_record()
             
@@ -168,7 +167,7 @@ class OdashboardAPI(http.Controller):
             result = engine.execute_unified_request(action, parameters, request.env, request)
             
             if result.get('success'):
-                return ApiHelper.json_valid_response(result.get('data'), 200)
+                return ApiHelper.json_valid_response(result.get('data'), 200, ApiHelper.cache_headers(result))
             else:
                 return ApiHelper.json_error_response(result.get('error', _('Unknown error')), 500)
                 
@@ -178,6 +177,86 @@ class OdashboardAPI(http.Controller):
             _logger.exception("Error in unified_execute: %s", e)
             return ApiHelper.json_error_response(str(e), 500)
 
+    @http.route(['/api/odash/execute/batch'], type='http', auth='api_key_dashboard', csrf=False, methods=['POST'], cors="*")
+    def unified_execute_batch(self):
+        """
+        Run several unified requests in one round trip, under one authentication
+        and one engine load. A failing item does not abort the others.
+        
+        Expected payload format:
+        {
+            "requests": [
+                {"id": "widget-1", "action": "process_dashboard_request", "parameters": {...}},
+                ...
+            ]
+        }
+        
+        Returns, keyed by request id (the item index when no id is given, ids must
+        be unique):
+        {
+            "widget-1": {"success": true, "data": {...}},
+            "widget-2": {"success": false, "error": "error message"}
+        }
+        """
+        try:
+            request_data = json.loads(request.httprequest.data.decode('utf-8'))
+            items = request_data.get('requests') if isinstance(request_data, dict) else request_data
+
+            if not isinstance(items, list):
+                return ApiHelper.json_error_response(_("Missing 'requests' list"), 400)
+            if len(items) > BATCH_MAX_ITEMS:
+                return ApiHelper.json_error_response(
+                    _("Too many requests in batch (maximum %s)") % BATCH_MAX_ITEMS, 400)
+
+            items = [item if isinstance(item, dict) else {} for item in items]
+            item_ids = [str(item.get('id', index)) for index, item in enumerate(items)]
+            duplicates = sorted({item_id for item_id in item_ids if item_ids.count(item_id) > 1})
+            if duplicates:
+                # Their results would overwrite each other
+                return ApiHelper.json_error_response(
+                    _("Duplicate request ids in batch: %s") % ', '.join(duplicates), 400)
+
+            engine = request.env['odash.engine'].sudo()._get_single_record()
+
+            results = {}
+            for item_id, item in zip(item_ids, items):
+                action = item.get('action')
+
+                if not action:
+                    results[item_id] = {'success': False, 'error': _("Missing 'action' parameter")}
+                    continue
+
+                try:
+                    # Isolate each item so that a failed query does not abort the others
+                    with request.env.cr.savepoint() as savepoint:
+                        result = engine.execute_unified_request(action, item.get('parameters') or {},
+                                                                request.env, request)
+                        if not result.get('success'):
+                            savepoint.rollback()
+                            request.env.invalidate_all()
+                except Exception as e:
+                    _logger.exception("Error in unified_execute_batch item %s: %s", item_id, e)
+                    request.env.invalidate_all()
+                    result = {'success': False, 'error': str(e)}
+
+                if result.get('success'):
+                    results[item_id] = {'success': True, 'data': result.get('data')}
+                    if result.get('cache'):
+                        results[item_id]['cache'] = result['cache']
+                else:
+                    results[item_id] = {
+                        'success': False,
+                        'error': ApiHelper.parse_database_error(str(result.get('error', _('Unknown error')))),
+                    }
+
+            return ApiHelper.json_valid_response(results, 200)
+
+        except json.JSONDecodeError:
+            return ApiHelper.json_error_response(_("Invalid JSON payload"), 400)
+        except Exception as e:
+            _logger.exception("Error in unified_execute_batch: %s", e)
+            return ApiHelper.json_error_response(str(e), 500)
+
     @http.route(['/api/odash/access'], type='http', auth='api_key_dashboard', csrf=False, methods=['GET'], cors="*")
     def get_access(self):
         token = request.env['ir.config_parameter'].sudo().get_param('odashboard.api.token')
@@ -245,8 +324,13 @@ class OdashboardAPI(http.Controller):
         This route is maintained for backward compatibility.
 
         :param model_name: Name of the Odoo model (example: 'sale.order')
-        :return: JSON with model records
+        :return: JSON with model records, or NDJSON lines with stream=1 (see _stream_model_records)
         """
+        if ApiHelper.is_stream_requested(kw):
+            # Streaming reads the records as the dashboard user, which needs its token
+            request.env['ir.http']._auth_method_api_key_dashboard()
+            return self._stream_model_records(model_name, kw)
+
         # Delegate to unified entry point
         engine = request.env['odash.engine'].sudo()._get_single_record()
         parameters = dict(kw)
@@ -303,7 +387,7 @@ class OdashboardAPI(http.Controller):
                                                       request.env)
 
                 if result.get('success'):
-                    return self._build_response([result.get('data')], 200)
+                    return self._build_response([result.get('data')], 200, ApiHelper.cache_headers(result))
                 else:
                     return ApiHelper.json_error_response(result.get('error', _('Unknown error')), 500)
                     
@@ -313,9 +397,22 @@ class OdashboardAPI(http.Controller):
             _logger.exception("Error in get_dashboard_data: %s", e)
             return ApiHelper.json_error_response(str(e), 500)
 
-    def _build_response(self, data, status=200):
+    def _stream_model_records(self, model_name, parameters):
+        """
+        Stream the records of a model as NDJSON (one JSON object per line), read in
+        chunks with keyset iteration so that the memory stays bounded whatever the
+        number of rows. Parameters: domain, fields, limit, chunk_size.
+        """
+        if not model_name:
+            return ApiHelper.json_error_response(_("Missing required parameter: %s") % 'model_name', 400)
+        try:
+            lines = request.env['odash.record.reader'].stream_records(model_name, parameters)
+        except AccessError as e:
+            return ApiHelper.json_error_response(e, 403)
+        except UserError as e:
+            return ApiHelper.json_error_response(e, 400)
+        return ApiHelper.ndjson_response(lines)
+
+    def _build_response(self, data, status=200, headers=None):
         """Build a consistent JSON response with the given data and status."""
-        headers = {'Content-Type': 'application/json'}
-        return Response(json.dumps(data, cls=OdashboardJSONEncoder),
-                        status=status,
-                        headers=headers)
+        return ApiHelper.make_json_response(data, status, headers)
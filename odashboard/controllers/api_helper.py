@@ -1,30 +1,65 @@
+import hashlib
 import json
 import re
 
-from datetime import datetime, date
+from datetime import datetime, timezone
 from typing import Optional, Dict
 
 from odoo import _, models
-from odoo.http import Response
+from odoo.http import Response, request
+from werkzeug.http import http_date
+
+from ..tools.serialization import COMPRESS_MIN_SIZE, compress, compression_encodings, json_dumps
 
 
 class ApiHelper:
 
     @staticmethod
-    def json_valid_response(data: any, valid_code: Optional[int] = 200) -> Dict[str, any]:
+    def make_json_response(data: any, status: Optional[int] = 200, headers: Optional[Dict[str, str]] = None) -> Response:
         """
-        Return a JsonResponse with the given data and status code if code is valid or no exceptions.
+        Serialize `data` to JSON and return it in a Response, compressed with brotli
+        or gzip when the client accepts it and the body is large enough.
+        This is the serialization path shared by all the controllers.
+        Every response varies on Accept-Encoding, compressed or not, so that a
+        cache never serves an uncompressed copy stored for one client as the
+        answer to another, nor the reverse.
         """
-        def default_converter(o):
-            if isinstance(o, (datetime, date)):
-                return o.isoformat()
-            return str(o)
-
+        body = json_dumps(data)
         headers = {
-            'Content-Type': 'application/json'
+            'Content-Type': 'application/json',
+            **(headers or {}),
         }
+        ApiHelper._add_vary(headers, 'Accept-Encoding')
+        if len(body) >= COMPRESS_MIN_SIZE:
+            encoding = ApiHelper._get_accepted_encoding()
+            if encoding:
+                body = compress(body, encoding)
+                headers['Content-Encoding'] = encoding
+        return Response(body, status=str(status), headers=headers)
 
-        return Response(json.dumps(data, default=default_converter), status=str(valid_code), headers=headers)
+    @staticmethod
+    def _add_vary(headers: Dict[str, str], header: str):
+        """Add `header` to the Vary header of `headers`, keeping the values already there."""
+        vary = [value.strip() for value in headers.get('Vary', '').split(',') if value.strip()]
+        if header.lower() not in (value.lower() for value in vary):
+            headers['Vary'] = ', '.join([*vary, header])
+
+    @staticmethod
+    def _get_accepted_encoding() -> Optional[str]:
+        """Return the preferred content encoding accepted by the current request, if any."""
+        try:
+            accept_encodings = request.httprequest.accept_encodings
+        except RuntimeError:
+            # Outside of a request
+            return None
+        return accept_encodings.best_match(compression_encodings())
+
+    @staticmethod
+    def json_valid_response(data: any, valid_code: Optional[int] = 200, headers: Optional[Dict[str, str]] = None) -> Dict[str, any]:
+        """
+        Return a JsonResponse with the given data and status code if code is valid or no exceptions.
+        """
+        return ApiHelper.make_json_response(data, valid_code, headers)
 
     @staticmethod
     def json_error_response(error: any, error_code: Optional[int] = 400) -> Dict[str, any]:
@@ -39,11 +74,74 @@ class ApiHelper:
         error_message = {
             "message": friendly_error
         }
+        return ApiHelper.make_json_response(error_message, error_code)
+
+    @staticmethod
+    def ndjson_response(lines, status: Optional[int] = 200) -> Response:
+        """
+        Return a streamed NDJSON response whose body is produced by `lines`,
+        a generator of bytes consumed while the response is sent.
+        """
+        return Response(lines, status=str(status), headers={'Content-Type': 'application/x-ndjson'},
+                        direct_passthrough=True)
 
+    @staticmethod
+    def is_stream_requested(parameters: Dict[str, any]) -> bool:
+        """Whether the parameters ask for a streamed (NDJSON) response."""
+        stream = parameters.get('stream')
+        if isinstance(stream, str):
+            return stream.lower() in ('1', 'true', 'ndjson')
+        return bool(stream)
+
+    @staticmethod
+    def cache_headers(result: Dict[str, any]) -> Dict[str, str]:
+        """
+        Return the headers reporting whether an engine result was served from cache.
+        """
+        if not result.get('cache'):
+            return {}
+        return {
+            'X-Odash-Cache': result['cache'].upper(),
+            'Access-Control-Expose-Headers': 'X-Odash-Cache',
+        }
+
+    @staticmethod
+    def make_etag(*parts) -> str:
+        """
+        Return a strong ETag (quoted) identifying the representation built from `parts`.
+        """
+        digest = hashlib.sha256(json.dumps(parts, default=str).encode('utf-8')).hexdigest()
+        return f'"{digest[:32]}"'
+
+    @staticmethod
+    def conditional_response(request, etag: str, last_modified: Optional[datetime] = None):
+        """
+        Handle If-None-Match and If-Modified-Since for a GET request.
+        Return (headers, response): the validator headers to send with the response,
+        and a 304 response if the client's copy is still current, None otherwise.
+        `last_modified` is a naive UTC datetime (as write_date).
+        """
         headers = {
-            'Content-Type': 'application/json',
+            'ETag': etag,
+            'Cache-Control': 'no-cache',
+            'Access-Control-Expose-Headers': 'ETag, Last-Modified',
+            # As the full response (make_json_response()), so that a 304 matches it
+            'Vary': 'Accept-Encoding',
         }
-        return Response(json.dumps(error_message), status=str(error_code), headers=headers)
+        if last_modified:
+            last_modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+            headers['Last-Modified'] = http_date(last_modified)
+
+        httprequest = request.httprequest
+        if httprequest.if_none_match:
+            # If-Modified-Since is ignored when If-None-Match is present (RFC 9110)
+            not_modified = httprequest.if_none_match.contains_weak(etag.strip('"'))
+        else:
+            since = httprequest.if_modified_since
+            not_modified = bool(last_modified and since and last_modified <= since)
+        if not_modified:
+            return headers, Response(status=304, headers=headers)
+        return headers, None
 
     @staticmethod
     def load_json_data(request):
@@ -4,31 +4,16 @@ from odoo import http, _
 from odoo.http import request
 
 from .api_helper import ApiHelper
+from ..tools.json_patch import JsonPatchError, JsonPatchTestFailed
 
 _logger = logging.getLogger(__name__)
 
 def check_access(config, user):
-
-    if user.has_group('odashboard.group_odashboard_editor'):
-        return True
-    
-    can_access = False
-
-    if not config.is_page_config:
-        return True
-    
-    if not config.security_group_ids and not config.user_ids:
-        can_access = True
-    else:
-        if user in config.user_ids:
-            can_access = True
-
-        if not can_access:
-            for group in config.security_group_ids:
-                if user in group.user_ids:
-                    can_access = True
-                    break
-    return can_access
+    """
+    Check if a user has access to a page configuration, see odash.access.index.
+    Editors and data configurations are always accessible.
+    """
+    return config.env['odash.access.index'].sudo().has_page_access(config, user)
 
 
 def check_category_access(category, user):
@@ -36,22 +21,62 @@ def check_category_access(category, user):
     Check if a user has access to a category based on security groups.
     Editors have access to all categories.
     """
-    if user.has_group('odashboard.group_odashboard_editor'):
-        return True
-    
-    # If no security groups defined, everyone can access
-    if not category.security_group_ids and not category.user_ids:
-        return True
+    return category.env['odash.access.index'].sudo().has_category_access(category, user)
 
-    if user in category.user_ids:
-        return True
-    
-    # Check if user is in any of the category's security groups
-    for group in category.security_group_ids:
-        if user in group.user_ids:
-            return True
-    
-    return False
+
+def conditional_get(config_ids, collection=False):
+    """
+    Check the client's cached copy of the representation of the given configs,
+    see ApiHelper.conditional_response(). The ETag is derived from the stored
+    revision of each config and the Last-Modified date from their write_date.
+    Collections are only validated with the ETag: removing a config from the
+    collection (deletion, access) does not change the latest write_date.
+    """
+    versions = request.env['odash.config'].sudo().get_config_versions(config_ids)
+    parts = [(config_id, *versions[config_id]) for config_id in config_ids if config_id in versions]
+    last_modified = None
+    if not collection:
+        last_modified = max((version[2] for version in versions.values() if version[2]), default=None)
+    return ApiHelper.conditional_response(request, ApiHelper.make_etag(request.env.lang, parts), last_modified)
+
+
+def patch_config(config, **kw):
+    """
+    Apply the JSON Patch (RFC 6902) of the request body to `config`.
+    The body is either the array of operations, or {"operations": [...], "revision": n}.
+    The update is optimistic: it is rejected with a 409 if the expected revision
+    (body, `revision` parameter or X-Odash-Revision header) is not the current one,
+    and with a 412 if the If-Match header does not match the current ETag.
+    """
+    data = ApiHelper.load_json_data(request)
+    revision = kw.get('revision') or request.httprequest.headers.get('X-Odash-Revision')
+    if isinstance(data, dict):
+        revision = data.get('revision', revision)
+        data = data.get('operations')
+    if not isinstance(data, list):
+        return ApiHelper.json_error_response(_("The body must be a JSON Patch array of operations"), 400)
+
+    current_revision = config._lock_revision()
+    if revision is not None and str(revision) != str(current_revision):
+        return ApiHelper.json_error_response(
+            _("The configuration has been modified (revision %(revision)s)", revision=current_revision), 409)
+    if_match = request.httprequest.if_match
+    if if_match:
+        headers, _not_modified = conditional_get(config.ids)
+        if not if_match.contains(headers['ETag'].strip('"')):
+            return ApiHelper.json_error_response(_("The configuration has been modified"), 412)
+
+    try:
+        config.apply_config_patch(data)
+    except JsonPatchTestFailed as e:
+        return ApiHelper.json_error_response(str(e), 409)
+    except JsonPatchError as e:
+        return ApiHelper.json_error_response(str(e), 400)
+
+    headers, _not_modified = conditional_get(config.ids)
+    headers['Access-Control-Expose-Headers'] += ', X-Odash-Revision'
+    headers['X-Odash-Revision'] = str(config.revision)
+    return ApiHelper.json_valid_response({'id': config.config_id, 'revision': config.revision}, 200, headers)
 
 
 class OdashConfigAPI(http.Controller):
@@ -71,20 +96,19 @@ class OdashConfigAPI(http.Controller):
         Get all page categories (filtered by user access)
         """
         try:
-            categories = request.env['odash.category'].sudo().search([('active', '=', True)], order='sequence asc')
+            category_ids = request.env['odash.access.index'].sudo().get_accessible_category_ids(request.env.user)
+            categories = request.env['odash.category'].sudo().browse(category_ids)
             result = []
             
             for category in categories:
-                # Check if user has access to this category
-                if check_category_access(category, request.env.user):
-                    result.append({
-                        'id': category.id,
-                        'name': category.name,
-                        'description': category.description or '',
-                        'icon': category.icon or '',
-                        'sequence': category.sequence,
-                        'page_count': category.page_count,
-                    })
+                result.append({
+                    'id': category.id,
+                    'name': category.name,
+                    'description': category.description or '',
+                    'icon': category.icon or '',
+                    'sequence': category.sequence,
+                    'page_count': category.page_count,
+                })
                 
             return ApiHelper.json_valid_response(result, 200)
             
@@ -149,17 +173,21 @@ class OdashConfigAPI(http.Controller):
             if method == 'GET':
                 # Get all page configurations
                 if page_id:
-                    return ApiHelper.json_valid_response([page_id.config], 200)
-
-                configs = odash_config.sudo().search([('is_page_config', '=', True)], order='sequence asc')
+                    headers, not_modified = conditional_get(page_id.ids)
+                    if not_modified:
+                        return not_modified
+                    return ApiHelper.json_valid_response([page_id.config], 200, headers)
+
+                # Pages accessible to the user, category access included
+                page_ids = request.env['odash.access.index'].sudo().get_accessible_page_ids(request.env.user)
+                headers, not_modified = conditional_get(page_ids, collection=True)
+                if not_modified:
+                    return not_modified
+                configs = odash_config.browse(page_ids)
                 result = []
                 
                 for config in configs:
-                    if config.config and check_access(config, request.env.user):
-                        # Also check category access if page has a category
-                        if config.category_id and not check_category_access(config.category_id, request.env.user):
-                            continue
-                        
+                    if config.config:
                         page_data = config.config.copy() if isinstance(config.config, dict) else config.config
 
                         page_data['category_id'] = config.category_id.id or None
@@ -173,7 +201,7 @@ class OdashConfigAPI(http.Controller):
                         
                         result.append(page_data)
                         
-                return ApiHelper.json_valid_response(result, 200)
+                return ApiHelper.json_valid_response(result, 200, headers)
             
             elif method == 'POST':
                 # Create a new page configuration
@@ -198,8 +226,6 @@ class OdashConfigAPI(http.Controller):
                     config_vals['category_id'] = category_id
                 
                 config = odash_config.sudo().create(config_vals)
-
-                odash_config.clean_unused_config()
                 
                 # Return config with category info
                 result = config.config.copy() if isinstance(config.config, dict) else config.config
@@ -217,12 +243,33 @@ class OdashConfigAPI(http.Controller):
             _logger.error(f"Error {operation} page configs: {e}")
             return ApiHelper.json_error_response(e, 500)
 
-    @http.route('/api/odash/pages/<string:config_id>', type='http', auth='api_key_dashboard', methods=['GET', 'PUT', 'DELETE'], csrf=False, cors="*")
+    @http.route('/api/odash/pages/index', type='http', auth='api_key_dashboard', methods=['GET'], csrf=False, cors="*")
+    def pages_index(self, **kw):
+        """
+        Get the summary of the accessible pages (id, title, sequence, category, last
+        modification) without their config, to render the page list.
+        Full configurations are fetched with /api/odash/pages/<config_id>.
+        """
+        try:
+            page_id = request.env.context.get('page_id')
+            if page_id:
+                page_ids = [page_id.id]
+            else:
+                page_ids = request.env['odash.access.index'].sudo().get_accessible_page_ids(request.env.user)
+            result = request.env['odash.config'].sudo().get_page_index(page_ids)
+            return ApiHelper.json_valid_response(result, 200)
+
+        except Exception as e:
+            _logger.error(f"Error getting page index: {e}")
+            return ApiHelper.json_error_response(e, 500)
+
+    @http.route('/api/odash/pages/<string:config_id>', type='http', auth='api_key_dashboard', methods=['GET', 'PUT', 'PATCH', 'DELETE'], csrf=False, cors="*")
     def page_resource(self, config_id, **kw):
         """
         Handle individual page configuration
         GET: Get a specific page configuration by ID
         PUT: Update an existing page configuration
+        PATCH: Partially update a page configuration with a JSON Patch, see patch_config()
         DELETE: Delete a page configuration
         """
 
@@ -239,6 +286,10 @@ class OdashConfigAPI(http.Controller):
                 return ApiHelper.json_error_response("Page configuration not found", 404)
             
             if method == 'GET':
+                headers, not_modified = conditional_get(config.ids)
+                if not_modified:
+                    return not_modified
+
                 # Return the configuration with category info
                 result = config.config.copy() if isinstance(config.config, dict) else config.config
                 
@@ -256,7 +307,7 @@ class OdashConfigAPI(http.Controller):
                         result['root']['props'] = {}
                     result['root']['props']['category_id'] = result['category_id']
                 
-                return ApiHelper.json_valid_response(result, 200)
+                return ApiHelper.json_valid_response(result, 200, headers)
                 
             elif method == 'PUT':
                 # Update the configuration
@@ -293,16 +344,18 @@ class OdashConfigAPI(http.Controller):
                     result['category_name'] = None
                 
                 return ApiHelper.json_valid_response(result, 200)
+
+            elif method == 'PATCH':
+                return patch_config(config.sudo(), **kw)
                 
             elif method == 'DELETE':
                 # Delete the configuration
                 config.sudo().unlink()
-                request.env['odash.config'].clean_unused_config()
                 
                 return ApiHelper.json_valid_response({"success": True}, 200)
                 
         except Exception as e:
-            operation = "getting" if method == 'GET' else ("updating" if method == 'PUT' else "deleting")
+            operation = "getting" if method == 'GET' else ("updating" if method in ('PUT', 'PATCH') else "deleting")
             _logger.error(f"Error {operation} page config: {e}")
             return ApiHelper.json_error_response(e, 500)
 
@@ -392,13 +445,16 @@ class OdashConfigAPI(http.Controller):
             if method == 'GET':
                 # Get all data configurations
                 configs = request.env['odash.config'].sudo().search([('is_page_config', '=', False)])
+                headers, not_modified = conditional_get(configs.ids, collection=True)
+                if not_modified:
+                    return not_modified
                 result = []
                 
                 for config in configs:
                     if config.config:
                         result.append(config.config)
                         
-                return ApiHelper.json_valid_response(result, 200)
+                return ApiHelper.json_valid_response(result, 200, headers)
             
             elif method == 'POST':
                 # Create a new data configuration
@@ -422,12 +478,13 @@ class OdashConfigAPI(http.Controller):
             _logger.error(f"Error {operation} data configs: {e}")
             return ApiHelper.json_error_response(e, 500)
 
-    @http.route('/api/odash/data/<string:config_id>', type='http', auth='api_key_dashboard', methods=['GET', 'PUT', 'DELETE'], csrf=False, cors="*")
+    @http.route('/api/odash/data/<string:config_id>', type='http', auth='api_key_dashboard', methods=['GET', 'PUT', 'PATCH', 'DELETE'], csrf=False, cors="*")
     def data_resource(self, config_id, **kw):
         """
         Handle individual data configuration
         GET: Get a specific data configuration by ID
         PUT: Update an existing data configuration
+        PATCH: Partially update a data configuration with a JSON Patch, see patch_config()
         DELETE: Delete a data configuration
         """
         method = request.httprequest.method
@@ -443,8 +500,11 @@ class OdashConfigAPI(http.Controller):
                 return ApiHelper.json_error_response("Data configuration not found", 404)
             
             if method == 'GET':
+                headers, not_modified = conditional_get(config.ids)
+                if not_modified:
+                    return not_modified
                 # Return the configuration
-                return ApiHelper.json_valid_response(config.config, 200)
+                return ApiHelper.json_valid_response(config.config, 200, headers)
                 
             elif method == 'PUT':
                 # Update the configuration
@@ -460,6 +520,9 @@ class OdashConfigAPI(http.Controller):
                 })
                 
                 return ApiHelper.json_valid_response(config.config, 200)
+
+            elif method == 'PATCH':
+                return patch_config(config.sudo(), **kw)
                 
             elif method == 'DELETE':
                 # Delete the configuration
@@ -468,6 +531,6 @@ class OdashConfigAPI(http.Controller):
                 return ApiHelper.json_valid_response({"success": True}, 200)
                 
         except Exception as e:
-            operation = "getting" if method == 'GET' else ("updating" if method == 'PUT' else "deleting")
+            operation = "getting" if method == 'GET' else ("updating" if method in ('PUT', 'PATCH') else "deleting")
             _logger.error(f"Error {operation} data config: {e}")
             return ApiHelper.json_error_response(e, 500)
@@ -1,5 +1,6 @@
 from odoo import http
 from odoo.http import request
+from odoo.tools import consteq
 from werkzeug.exceptions import NotFound
 import requests
 from .api_helper import ApiHelper
@@ -22,6 +23,12 @@ class Main(http.Controller):
         page = request.env['odash.config'].sudo().search([('is_page_config', '=', True), ('id', '=', page_id)], limit=1)
         if not page or page.secret_access_token != access_token:
             raise NotFound()
+
+        if kwargs.get('async') in ('1', 'true'):
+            # Rendered in the background, see odash.pdf.render.job
+            job = request.env['odash.pdf.render.job'].enqueue(page)
+            return ApiHelper.json_valid_response(self._get_pdf_job_data(job), 202)
+
         connection_url = request.env['odash.dashboard'].sudo().get_public_dashboard(page.id)
 
         pdf_url = request.env['ir.config_parameter'].sudo().get_param('odashboard.pdf.url', 'https://pdf.odashboard.app')
@@ -50,6 +57,34 @@ class Main(http.Controller):
             ],
         )
 
+    @http.route('/dashboard/public/pdf/job/<int:job_id>/<string:access_token>', type='http', auth='public')
+    def dashboard_public_pdf_job(self, job_id, access_token, **kwargs):
+        job = self._get_pdf_job(job_id, access_token)
+        return ApiHelper.json_valid_response(self._get_pdf_job_data(job), 200)
+
+    @http.route('/dashboard/public/pdf/job/<int:job_id>/<string:access_token>/download', type='http', auth='public')
+    def dashboard_public_pdf_job_download(self, job_id, access_token, **kwargs):
+        job = self._get_pdf_job(job_id, access_token)
+        if job.state != 'done':
+            return ApiHelper.json_valid_response(self._get_pdf_job_data(job), 409)
+        # Served from the filestore without loading the PDF in memory
+        stream = request.env['ir.binary']._get_stream_from(
+            job, 'pdf_file', filename='odashboard.pdf', mimetype='application/pdf')
+        return stream.get_response(as_attachment=False)
+
+    def _get_pdf_job(self, job_id, access_token):
+        job = request.env['odash.pdf.render.job'].sudo().browse(job_id).exists()
+        if not job or not consteq(job.access_token, access_token):
+            raise NotFound()
+        return job
+
+    def _get_pdf_job_data(self, job):
+        base_path = f"/dashboard/public/pdf/job/{job.id}/{job.access_token}"
+        data = job.get_status()
+        data['status_url'] = base_path
+        data['download_url'] = f"{base_path}/download" if job.state == 'done' else None
+        return data
+
     @http.route(["/api/odash/refresh-dashboard"], type='http', auth='api_key_dashboard', csrf=False, methods=['post'],
                 cors="*")
     def refresh_dashboard(self, **kw):
@@ -2,8 +2,19 @@ from . import res_config_settings
 from . import odash_config
 from . import odash_category
 from . import odash_dashboard
+from . import base
 from . import ir_http
+from . import ir_websocket
+from . import ir_attachment
 from . import odash_engine
+from . import odash_shared_cache
+from . import odash_record_reader
+from . import odash_change_tracker
+from . import odash_live_update
 from . import odash_security_group
 from . import odash_pdf_report
 from . import odash_pdf_generator
+from . import odash_pdf_render_cache
+from . import odash_pdf_render_job
+from . import odash_pdf_report_job
+from . import odash_access_index
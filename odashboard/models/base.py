@@ -0,0 +1,30 @@
+from odoo import api, models
+
+
+class Base(models.AbstractModel):
+    _inherit = 'base'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._odash_notify_change()
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        self._odash_notify_change()
+        return result
+
+    def unlink(self):
+        self._odash_notify_change()
+        if self:
+            self.env['odash.change.tracker'].register_deletion(self)
+        return super().unlink()
+
+    def _odash_notify_change(self):
+        """
+        Bump the change counters of this model (invalidating the dashboard results
+        cached from it) and push the change to the open dashboards.
+        """
+        if self:
+            self.env['odash.change.tracker'].register_change(self)
@@ -0,0 +1,48 @@
+import hashlib
+import io
+import os
+import shutil
+
+from odoo import models, api
+
+CHUNK_SIZE = 64 * 1024
+
+
+class IrAttachment(models.Model):
+    _inherit = 'ir.attachment'
+
+    @api.model
+    def _odash_create_from_file(self, file, values):
+        """
+        Create an attachment with the content of the binary `file`, copied to the
+        filestore by chunks instead of being loaded in memory (for the PDF reports).
+        """
+        file.seek(0)
+        if self._storage() != 'file':
+            return self.create(dict(values, raw=file.read()))
+
+        checksum = hashlib.sha1()
+        file_size = 0
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+            checksum.update(chunk)
+            file_size += len(chunk)
+        checksum = checksum.hexdigest()
+
+        fname, full_path = self._get_path(b'', checksum)
+        if not os.path.exists(full_path):
+            file.seek(0)
+            temp_path = f"{full_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as target:
+                shutil.copyfileobj(file, target, CHUNK_SIZE)
+            os.replace(temp_path, full_path)
+            # Removed by the filestore garbage collector if the transaction is rolled back
+            self._mark_for_gc(fname)
+
+        return self.create(dict(values, store_fname=fname, checksum=checksum, file_size=file_size))
+
+    def _odash_open(self):
+        """Return the content of the attachment as a binary file, read from the filestore when stored there."""
+        self.ensure_one()
+        if self.store_fname:
+            return open(self._full_path(self.store_fname), 'rb')
+        return io.BytesIO(self.raw or b'')
@@ -3,6 +3,21 @@ from odoo.http import request
 from odoo.tools import get_lang
 from werkzeug.exceptions import Unauthorized
 
+from ..tools.cache import LRUCache
+
+# Per-worker caches of the dashboard authentication:
+# (db, token) -> (dashboard id, user id, page id), checked against the dashboard row
+# on use (other workers may have changed it), dropped when dashboards are written here
+# (db, context lang) -> installed lang code
+_token_cache = LRUCache(max_size=4096, ttl=60)
+_lang_cache = LRUCache(max_size=256, ttl=300)
+
+
+def invalidate_token_cache(dbname, tokens):
+    for token in tokens:
+        if token:
+            _token_cache.pop((dbname, token))
+
 
 class IrHttp(models.AbstractModel):
     _inherit = "ir.http"
@@ -16,19 +31,46 @@ class IrHttp(models.AbstractModel):
         if not api_key or len(api_key) < 8:
             raise Unauthorized("Authorization header with API key missing")
         api_key = api_key[7:]
+        dbname = request.env.cr.dbname
 
         # Make sure the lang in the context always match lang installed in the Odoo System
         context_lang = request.context.get("lang") or "en_US"
-        lang_code = get_lang(request.env, context_lang).code
-        request.session.context["lang"] = lang_code
-        request.update_context(lang=lang_code)
+        lang_code = _lang_cache.get((dbname, context_lang))
+        if lang_code is None:
+            lang_code = get_lang(request.env, context_lang).code
+            _lang_cache.set((dbname, context_lang), lang_code)
+        if request.session.context.get("lang") != lang_code:
+            request.session.context["lang"] = lang_code
+        if request.context.get("lang") != lang_code:
+            request.update_context(lang=lang_code)
+
+        dashboard_values = _token_cache.get((dbname, api_key))
+        if dashboard_values is not None:
+            # One primary key lookup: the dashboard may have been deleted or changed by another worker
+            dashboard_id, user_id, page_id = dashboard_values
+            request.env.cr.execute("""
+                SELECT 1 FROM odash_dashboard
+                WHERE id = %s AND token = %s
+                  AND user_id IS NOT DISTINCT FROM %s AND page_id IS NOT DISTINCT FROM %s
+            """, (dashboard_id, api_key, user_id or None, page_id or None))
+            if not request.env.cr.fetchone():
+                _token_cache.pop((dbname, api_key))
+                dashboard_values = None
+        if dashboard_values is None:
+            dashboard = request.env['odash.dashboard'].sudo().search([('token', '=', api_key)], limit=1)
 
-        dashboard = request.env['odash.dashboard'].sudo().search([('token', '=', api_key)], limit=1)
+            if not dashboard:
+                raise Unauthorized(_("Invalid token"))
 
-        if not dashboard:
-            raise Unauthorized(_("Invalid token"))
+            dashboard_values = (dashboard.id, dashboard.user_id.id, dashboard.page_id.id)
+            _token_cache.set((dbname, api_key), dashboard_values)
 
+        dashboard_id, user_id, page_id = dashboard_values
         request.update_env(
-            user=dashboard.user_id,
-            context=dict(request.context, page_id=dashboard.page_id, dashboard_id=dashboard)
+            user=request.env['res.users'].browse(user_id),
+            context=dict(
+                request.context,
+                page_id=request.env['odash.config'].sudo().browse(page_id),
+                dashboard_id=request.env['odash.dashboard'].sudo().browse(dashboard_id),
+            )
         )
@@ -0,0 +1,27 @@
+from odoo import models
+
+from .odash_live_update import BUS_CHANNEL, COMPANY_CHANNEL_PREFIX
+
+
+class IrWebsocket(models.AbstractModel):
+    _inherit = 'ir.websocket'
+
+    def _build_bus_channel_list(self, channels):
+        # Open dashboards subscribe to the live updates of the companies of the user only
+        channels = list(channels)
+        requested = [
+            channel for channel in channels
+            if isinstance(channel, str) and (channel == BUS_CHANNEL or channel.startswith(COMPANY_CHANNEL_PREFIX))
+        ]
+        for channel in requested:
+            channels.remove(channel)
+        if requested and self.env.uid and self.env.user.has_group('odashboard.group_odashboard_viewer'):
+            company_ids = {
+                int(channel[len(COMPANY_CHANNEL_PREFIX):]) for channel in requested
+                if channel[len(COMPANY_CHANNEL_PREFIX):].isdigit()
+            }
+            companies = self.env.user.company_ids.filtered(lambda company: company.id in company_ids)
+            channels += [(company, BUS_CHANNEL) for company in companies]
+            if BUS_CHANNEL in requested:
+                channels.append(BUS_CHANNEL)
+        return super()._build_bus_channel_list(channels)
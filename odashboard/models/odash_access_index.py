@@ -0,0 +1,175 @@
+from odoo import models, api
+
+EDITOR_GROUP = 'odashboard.group_odashboard_editor'
+
+
+class OdashAccessIndex(models.AbstractModel):
+    """
+    Materialized user -> page and user -> category access, so that listings
+    are filtered with one SQL query instead of looping over security groups.
+
+    Only restricted pages and categories (with security groups or users) have
+    rows: odash_page_access and odash_category_access hold the users allowed
+    directly or through a security group. Rows are rebuilt incrementally when
+    the access of a page or category, or the members of a group change, and
+    removed by cascade when pages, categories or users are deleted.
+    """
+    _name = 'odash.access.index'
+    _description = 'Dashboard Access Index'
+
+    def init(self):
+        self.env.cr.execute("""
+            CREATE TABLE IF NOT EXISTS odash_page_access (
+                user_id integer NOT NULL REFERENCES res_users(id) ON DELETE CASCADE,
+                page_id integer NOT NULL REFERENCES odash_config(id) ON DELETE CASCADE,
+                PRIMARY KEY (user_id, page_id)
+            )
+        """)
+        self.env.cr.execute("""
+            CREATE TABLE IF NOT EXISTS odash_category_access (
+                user_id integer NOT NULL REFERENCES res_users(id) ON DELETE CASCADE,
+                category_id integer NOT NULL REFERENCES odash_category(id) ON DELETE CASCADE,
+                PRIMARY KEY (user_id, category_id)
+            )
+        """)
+        self.env.cr.execute("CREATE INDEX IF NOT EXISTS odash_page_access_page_id_idx ON odash_page_access (page_id)")
+        self.env.cr.execute("CREATE INDEX IF NOT EXISTS odash_category_access_category_id_idx ON odash_category_access (category_id)")
+        self.refresh_all()
+
+    # ---- Maintenance ----
+
+    def _get_access_query(self, model_name):
+        """
+        Return the query selecting (record id, user id) for every user allowed on
+        a record of `model_name` (odash.config or odash.category), directly or
+        through one of its security groups.
+        """
+        Model = self.env[model_name]
+        users = Model._fields['user_ids']
+        groups = Model._fields['security_group_ids']
+        members = self.env['odash.security.group']._fields['user_ids']
+        return f"""
+            SELECT direct.{users.column1} AS res_id, direct.{users.column2} AS user_id
+            FROM {users.relation} direct
+            UNION
+            SELECT record_group.{groups.column1}, member.{members.column2}
+            FROM {groups.relation} record_group
+            JOIN {members.relation} member ON member.{members.column1} = record_group.{groups.column2}
+        """
+
+    def _flush_access(self):
+        self.env['odash.config'].flush_model(['security_group_ids', 'user_ids', 'is_restricted'])
+        self.env['odash.category'].flush_model(['security_group_ids', 'user_ids', 'is_restricted'])
+        self.env['odash.security.group'].flush_model(['user_ids'])
+
+    def _refresh(self, model_name, table, column, ids=None):
+        self._flush_access()
+        if ids is not None:
+            ids = tuple(ids)
+            if not ids:
+                return
+            self.env.cr.execute(f"DELETE FROM {table} WHERE {column} IN %s", (ids,))
+            where, params = "WHERE access.res_id IN %s", (ids,)
+        else:
+            self.env.cr.execute(f"DELETE FROM {table}")
+            where, params = "", ()
+        self.env.cr.execute(f"""
+            INSERT INTO {table} ({column}, user_id)
+            SELECT access.res_id, access.user_id
+            FROM ({self._get_access_query(model_name)}) access
+            {where}
+            ON CONFLICT DO NOTHING
+        """, params)
+
+    @api.model
+    def refresh_pages(self, page_ids=None):
+        """Rebuild the access rows of the given pages (all pages if None)."""
+        self._refresh('odash.config', 'odash_page_access', 'page_id', page_ids)
+
+    @api.model
+    def refresh_categories(self, category_ids=None):
+        """Rebuild the access rows of the given categories (all categories if None)."""
+        self._refresh('odash.category', 'odash_category_access', 'category_id', category_ids)
+
+    @api.model
+    def refresh_groups(self, group_ids):
+        """Rebuild the access rows of the pages and categories using the given security groups."""
+        self._flush_access()
+        group_ids = tuple(group_ids)
+        if not group_ids:
+            return
+        for model_name, method in (('odash.config', self.refresh_pages), ('odash.category', self.refresh_categories)):
+            field = self.env[model_name]._fields['security_group_ids']
+            self.env.cr.execute(
+                f"SELECT DISTINCT {field.column1} FROM {field.relation} WHERE {field.column2} IN %s",
+                (group_ids,))
+            method([row[0] for row in self.env.cr.fetchall()])
+
+    @api.model
+    def refresh_all(self):
+        self.refresh_pages()
+        self.refresh_categories()
+
+    # ---- Queries ----
+
+    @api.model
+    def get_accessible_page_ids(self, user):
+        """Return the ids of the pages `user` can access, ordered by sequence."""
+        self._flush_access()
+        self.env['odash.config'].flush_model(['is_page_config', 'category_id', 'sequence'])
+        if user.has_group(EDITOR_GROUP):
+            self.env.cr.execute("""
+                SELECT page.id FROM odash_config page
+                WHERE page.is_page_config
+                ORDER BY page.sequence, page.id
+            """)
+        else:
+            self.env.cr.execute("""
+                SELECT page.id
+                FROM odash_config page
+                LEFT JOIN odash_page_access page_access
+                    ON page_access.page_id = page.id AND page_access.user_id = %(user_id)s
+                LEFT JOIN odash_category category ON category.id = page.category_id
+                LEFT JOIN odash_category_access category_access
+                    ON category_access.category_id = page.category_id AND category_access.user_id = %(user_id)s
+                WHERE page.is_page_config
+                  AND (NOT page.is_restricted OR page_access.page_id IS NOT NULL)
+                  AND (category.id IS NULL OR NOT category.is_restricted OR category_access.category_id IS NOT NULL)
+                ORDER BY page.sequence, page.id
+            """, {'user_id': user.id})
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    @api.model
+    def get_accessible_category_ids(self, user):
+        """Return the ids of the active categories `user` can access, ordered by sequence."""
+        self._flush_access()
+        self.env['odash.category'].flush_model(['active', 'sequence'])
+        self.env.cr.execute("""
+            SELECT category.id
+            FROM odash_category category
+            LEFT JOIN odash_category_access category_access
+                ON category_access.category_id = category.id AND category_access.user_id = %(user_id)s
+            WHERE category.active
+              AND (%(editor)s OR NOT category.is_restricted OR category_access.category_id IS NOT NULL)
+            ORDER BY category.sequence, category.id
+        """, {'user_id': user.id, 'editor': user.has_group(EDITOR_GROUP)})
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    @api.model
+    def has_page_access(self, page, user):
+        """Check the access of `user` to a page, without its category."""
+        if user.has_group(EDITOR_GROUP) or not page.is_page_config or not page.is_restricted:
+            return True
+        self._flush_access()
+        self.env.cr.execute("SELECT 1 FROM odash_page_access WHERE user_id = %s AND page_id = %s",
+                            (user.id, page.id))
+        return bool(self.env.cr.rowcount)
+
+    @api.model
+    def has_category_access(self, category, user):
+        if user.has_group(EDITOR_GROUP) or not category.is_restricted:
+            return True
+        self._flush_access()
+        self.env.cr.execute("SELECT 1 FROM odash_category_access WHERE user_id = %s AND category_id = %s",
+                            (user.id, category.id))
+        return bool(self.env.cr.rowcount)
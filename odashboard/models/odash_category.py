@@ -57,9 +57,27 @@ class OdashCategory(models.Model):
         domain=[('share', '=', False)],
         help="Users that can access this category"
     )
+    is_restricted = fields.Boolean(
+        string='Restricted Access',
+        compute='_compute_is_restricted',
+        store=True,
+        help="Access is limited to some security groups or users"
+    )
     access_summary = fields.Char(string='Access summary', compute='_compute_access_summary')
 
     
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env['odash.access.index'].refresh_categories(records.ids)
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        if {'security_group_ids', 'user_ids'} & set(vals):
+            self.env['odash.access.index'].refresh_categories(self.ids)
+        return result
+
     @api.depends('page_ids')
     def _compute_page_count(self):
         for record in self:
@@ -98,6 +116,11 @@ class OdashCategory(models.Model):
             'target': 'current',
         }
 
+    @api.depends('security_group_ids', 'user_ids')
+    def _compute_is_restricted(self):
+        for record in self:
+            record.is_restricted = bool(record.security_group_ids or record.user_ids)
+
     @api.depends('security_group_ids', 'user_ids')
     def _compute_access_summary(self):
         for record in self:
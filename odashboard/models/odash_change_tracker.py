@@ -0,0 +1,253 @@
+import logging
+import time
+
+from odoo import models, api, tools
+
+_logger = logging.getLogger(__name__)
+
+# Models not read by any dashboard for this long stop being tracked
+WATCH_RETENTION_DAYS = 7
+# Deleted record ids are kept this long for the change feeds
+TOMBSTONE_RETENTION_DAYS = 7
+# The last use of a watched model is recorded at most this often (seconds) per worker
+TOUCH_INTERVAL = 3600
+_last_touched = {}
+
+
+class OdashChangeTracker(models.AbstractModel):
+    """
+    Change counters of the models read by dashboards, per model and company.
+
+    The models read by dashboards are recorded in odash_watched_model (see
+    watch_models()). Every transaction creating, writing or unlinking records
+    of one of them appends, once committed, a row per (model, company) to
+    odash_change_log with a value of the odash_change_seq sequence: the
+    version of a model is the greatest value logged for it.
+
+    Rows are appended after the commit, so that a version read in a snapshot
+    always covers the changes visible in that snapshot: caches store the
+    versions read along with their result, and check them with one indexed
+    query (get_versions()) instead of guessing with a TTL. A cron compacts the
+    log to the latest row per (model, company).
+
+    The ids of the deleted records of those models are also kept for a while
+    in odash_tombstone, for the change feeds (get_model_changes).
+    """
+    _name = 'odash.change.tracker'
+    _description = 'Dashboard Change Tracker'
+
+    def init(self):
+        self.env.cr.execute("""
+            CREATE TABLE IF NOT EXISTS odash_watched_model (
+                model varchar PRIMARY KEY,
+                last_used timestamp NOT NULL DEFAULT (now() at time zone 'UTC')
+            )
+        """)
+        self.env.cr.execute("CREATE SEQUENCE IF NOT EXISTS odash_change_seq")
+        # company_id is 0 for records without company
+        self.env.cr.execute("""
+            CREATE TABLE IF NOT EXISTS odash_change_log (
+                model varchar NOT NULL,
+                company_id integer NOT NULL,
+                version bigint NOT NULL
+            )
+        """)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS odash_change_log_model_company_version_idx
+            ON odash_change_log (model, company_id, version DESC)
+        """)
+        self.env.cr.execute("""
+            CREATE TABLE IF NOT EXISTS odash_tombstone (
+                model varchar NOT NULL,
+                res_id integer NOT NULL,
+                deleted_at timestamp NOT NULL DEFAULT (now() at time zone 'UTC')
+            )
+        """)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS odash_tombstone_model_deleted_at_idx
+            ON odash_tombstone (model, deleted_at)
+        """)
+
+    # ---- Watched models ----
+
+    @api.model
+    @tools.ormcache()
+    def get_watched_models(self):
+        """Return the names of the models read by dashboards recently."""
+        # Records may be written while the module is being installed, before init()
+        self.env.cr.execute("SELECT to_regclass('odash_watched_model') IS NOT NULL")
+        if not self.env.cr.fetchone()[0]:
+            return frozenset()
+        self.env.cr.execute("""
+            SELECT model FROM odash_watched_model
+            WHERE last_used > (now() at time zone 'UTC') - %s * interval '1 day'
+        """, (WATCH_RETENTION_DAYS,))
+        return frozenset(row[0] for row in self.env.cr.fetchall())
+
+    @api.model
+    def watch_models(self, model_names):
+        """
+        Track the changes of the given models from now on, in all workers, and
+        keep the models already tracked from expiring while dashboards read them.
+        """
+        model_names = set(model_names)
+        watched = self.get_watched_models()
+        new_models = model_names - watched
+        now = time.monotonic()
+        dbname = self.env.cr.dbname
+        used_models = {
+            model for model in model_names & watched
+            if now - _last_touched.get((dbname, model), 0) > TOUCH_INTERVAL
+        }
+        if not new_models and not used_models:
+            return
+        # Own transaction: the request may be rolled back, and other workers must see it
+        with self.env.registry.cursor() as cr:
+            inserted = []
+            if new_models:
+                # Models inserted, or expired and watched again: the watched set changes
+                cr.execute("""
+                    INSERT INTO odash_watched_model AS watched (model, last_used)
+                    SELECT unnest(%s::varchar[]), now() at time zone 'UTC'
+                    ON CONFLICT (model) DO UPDATE SET last_used = EXCLUDED.last_used
+                    WHERE watched.last_used <= (now() at time zone 'UTC') - %s * interval '1 day'
+                    RETURNING model
+                """, (sorted(new_models), WATCH_RETENTION_DAYS))
+                inserted = [row[0] for row in cr.fetchall()]
+            cr.execute("""
+                UPDATE odash_watched_model SET last_used = now() at time zone 'UTC'
+                WHERE model = ANY(%s) AND last_used < (now() at time zone 'UTC') - %s * interval '1 second'
+            """, (sorted(model_names - set(inserted)), TOUCH_INTERVAL))
+        for model in model_names:
+            _last_touched[(dbname, model)] = now
+        if inserted:
+            # Only when the watched set changes: signaled to the other workers at the end of the request
+            self.env.registry.clear_cache('default')
+
+    # ---- Changes ----
+
+    @api.model
+    def register_change(self, records):
+        """
+        Record the change of `records` (created, written or about to be unlinked):
+        their model and companies are logged once the transaction commits, and
+        pushed to the open dashboards (odash.live.update).
+        """
+        if not records or records._name not in self.get_watched_models():
+            return
+        company_field = records._fields.get('company_id')
+        if company_field and company_field.type == 'many2one' and company_field.store:
+            company_ids = set(records.sudo().mapped(lambda record: record.company_id.id or 0))
+        else:
+            company_ids = {0}
+
+        changes = self.env.cr.postcommit.data.setdefault('odash.changes', set())
+        if not changes:
+            registry = self.env.registry
+
+            @self.env.cr.postcommit.add
+            def log_changes():
+                try:
+                    with registry.cursor() as cr:
+                        cr.execute("""
+                            INSERT INTO odash_change_log (model, company_id, version)
+                            SELECT change.model, change.company_id, nextval('odash_change_seq')
+                            FROM unnest(%s::varchar[], %s::integer[]) AS change(model, company_id)
+                        """, ([model for model, _company in sorted(changes)],
+                              [company for _model, company in sorted(changes)]))
+                except Exception as e:
+                    _logger.warning("Could not log dashboard changes %s: %s", changes, e)
+        changes.update((records._name, company_id) for company_id in company_ids)
+
+        self.env['odash.live.update'].queue_notification(records._name, company_ids)
+
+    @api.model
+    def register_deletion(self, records):
+        """Keep the ids of `records`, about to be unlinked, for the change feeds."""
+        if not records or records._name not in self.get_watched_models():
+            return
+        self.env.cr.execute("""
+            INSERT INTO odash_tombstone (model, res_id)
+            SELECT %s, unnest(%s::integer[])
+        """, (records._name, records.ids))
+
+    @api.model
+    def get_deleted_ids(self, model_name, since):
+        """Return the ids of the records of `model_name` deleted since `since` (UTC)."""
+        self.env.cr.execute("""
+            SELECT DISTINCT res_id FROM odash_tombstone
+            WHERE model = %s AND deleted_at >= %s
+        """, (model_name, since))
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    @api.model
+    def is_tombstone_expired(self, since):
+        """Whether deletions since `since` (UTC) may have been forgotten already."""
+        self.env.cr.execute(
+            "SELECT %s::timestamp < (now() at time zone 'UTC') - %s * interval '1 day'",
+            (since, TOMBSTONE_RETENTION_DAYS))
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def get_safe_timestamp(self):
+        """
+        Return the start (UTC) of the oldest transaction in progress on the database,
+        minus a safety margin. Changes not committed yet are stamped (write_date,
+        deletion date) after it, so a change feed following changes up to it misses
+        none. It must be the first query of the transaction, so that the transactions
+        in progress are those of its snapshot.
+        """
+        self.env.cr.execute("""
+            SELECT (LEAST(min(xact_start), now()) - interval '1 second') at time zone 'UTC'
+            FROM pg_stat_activity
+            WHERE datname = current_database() AND xact_start IS NOT NULL
+        """)
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def get_versions(self, model_names, company_ids=None):
+        """
+        Return {model name: version} for the given models, in one query: the
+        version changes whenever records of the model, of one of `company_ids`
+        (all companies if None) or without company, are created, written or
+        unlinked. Models never changed have version 0.
+        """
+        model_names = sorted(set(model_names))
+        if not model_names:
+            return {}
+        if company_ids is None:
+            self.env.cr.execute("""
+                SELECT model, max(version) FROM odash_change_log
+                WHERE model = ANY(%s)
+                GROUP BY model
+            """, (model_names,))
+        else:
+            self.env.cr.execute("""
+                SELECT model, max(version) FROM odash_change_log
+                WHERE model = ANY(%s) AND company_id = ANY(%s)
+                GROUP BY model
+            """, (model_names, [0, *company_ids]))
+        versions = dict.fromkeys(model_names, 0)
+        versions.update(self.env.cr.fetchall())
+        return versions
+
+    @api.model
+    def gc(self):
+        """
+        Cron: keep only the latest row of each (model, company) in the change log,
+        and forget the deletions older than the tombstone retention.
+        """
+        self.env.cr.execute(
+            "DELETE FROM odash_tombstone WHERE deleted_at < (now() at time zone 'UTC') - %s * interval '1 day'",
+            (TOMBSTONE_RETENTION_DAYS,))
+        self.env.cr.execute("""
+            DELETE FROM odash_change_log log
+            USING (
+                SELECT model, company_id, max(version) AS version
+                FROM odash_change_log
+                GROUP BY model, company_id
+            ) latest
+            WHERE log.model = latest.model AND log.company_id = latest.company_id
+              AND log.version < latest.version
+        """)
+        _logger.info("Dashboard change log compacted: %s rows removed", self.env.cr.rowcount)
@@ -1,4 +1,4 @@
-import json
+import re
 import uuid
 
 from odoo import fields, models, api, _
@@ -6,6 +6,33 @@ import base64
 from datetime import datetime
 from odoo.exceptions import UserError
 
+from ..tools import json_patch
+
+# Longest JSON string kept as a whole in the reference index
+REFERENCE_MAX_LENGTH = 255
+UUID_RE = re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}')
+
+
+def extract_references(config):
+    """
+    Return the strings of a page config that may reference a component:
+    every key and short string value, and the UUIDs embedded in any string.
+    """
+    references = set()
+    stack = [config]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+        elif isinstance(value, str):
+            if len(value) <= REFERENCE_MAX_LENGTH:
+                references.add(value)
+            references.update(UUID_RE.findall(value))
+    return references
+
 
 class OdashConfig(models.Model):
     _name = 'odash.config'
@@ -20,6 +47,8 @@ class OdashConfig(models.Model):
     is_page_config = fields.Boolean(string='Is Page Config', default=False)
     config_id = fields.Char(string='Config ID')
     config = fields.Json(string='Config')
+    revision = fields.Integer(string='Revision', default=1, readonly=True, copy=False,
+                              help="Incremented each time the configuration changes")
     
     category_id = fields.Many2one(
         comodel_name='odash.category',
@@ -30,6 +59,8 @@ class OdashConfig(models.Model):
 
     security_group_ids = fields.Many2many(comodel_name='odash.security.group', string='Security Groups')
     user_ids = fields.Many2many(comodel_name='res.users', string='Users', domain=[('share', '=', False)])
+    is_restricted = fields.Boolean(string='Restricted Access', compute='_compute_is_restricted', store=True,
+                                   help="Access is limited to some security groups or users")
 
     access_token = fields.Char(string='Access token', default=lambda self: uuid.uuid4())
     secret_access_token = fields.Char(string='Secret Access token', default=lambda self: uuid.uuid4())
@@ -37,18 +68,199 @@ class OdashConfig(models.Model):
     allow_public_access = fields.Boolean(string='Allow public access')
     public_url = fields.Char(string='Public URL', compute="_compute_public_url")
 
+    def init(self):
+        # Strings of each page config that may reference a component, see extract_references()
+        self.env.cr.execute("""
+            CREATE TABLE IF NOT EXISTS odash_config_reference (
+                page_id integer NOT NULL REFERENCES odash_config(id) ON DELETE CASCADE,
+                reference varchar NOT NULL,
+                PRIMARY KEY (page_id, reference)
+            )
+        """)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS odash_config_reference_reference_idx
+            ON odash_config_reference (reference)
+        """)
+        self.env.cr.execute("SELECT 1 FROM odash_config_reference LIMIT 1")
+        if not self.env.cr.rowcount:
+            self.search([('is_page_config', '=', True)])._index_references()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env['odash.access.index'].refresh_pages(records.ids)
+        records.filtered('is_page_config')._index_references()
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        if {'config', 'category_id'} & set(vals) and self.ids:
+            self.env.cr.execute("UPDATE odash_config SET revision = revision + 1 WHERE id IN %s", (tuple(self.ids),))
+            self.invalidate_recordset(['revision'])
+        if {'security_group_ids', 'user_ids'} & set(vals):
+            self.env['odash.access.index'].refresh_pages(self.ids)
+        if {'config', 'is_page_config'} & set(vals) and not self.env.context.get('odash_skip_reindex'):
+            self._index_references()
+        return result
+
+    def _lock_revision(self):
+        """Lock the config row until the end of the transaction and return its current revision."""
+        self.ensure_one()
+        self.env.cr.execute("SELECT revision FROM odash_config WHERE id = %s FOR UPDATE", (self.id,))
+        return self.env.cr.fetchone()[0]
+
+    @staticmethod
+    def _patch_needs_reindex(config, operations):
+        """
+        Return whether applying `operations` may change the component references of
+        `config`: only tests and replacements of a scalar (non string) value by
+        another one keep them unchanged.
+        """
+        for operation in operations:
+            if operation['op'] == 'test':
+                continue
+            if operation['op'] != 'replace':
+                return True
+            try:
+                old_value = json_patch.resolve_pointer(config, operation['path'])
+            except json_patch.JsonPatchError:
+                return True
+            if isinstance(old_value, (str, dict, list)) or isinstance(operation['value'], (str, dict, list)):
+                return True
+        return False
+
+    def apply_config_patch(self, operations):
+        """
+        Apply JSON Patch `operations` (RFC 6902) to the config, raising
+        json_patch.JsonPatchError if they cannot be applied. The name is only
+        recomputed, and the references only reindexed, when the patch may change them.
+        """
+        self.ensure_one()
+        config = json_patch.apply_patch(self.config or {}, operations)
+        if not isinstance(config, dict):
+            raise json_patch.JsonPatchError("The patched configuration must be an object")
+        config['id'] = self.config_id
+
+        paths = [path for operation in operations for path in (operation.get('path'), operation.get('from')) if path is not None]
+        record = self.with_context(odash_skip_reindex=not self._patch_needs_reindex(self.config or {}, operations))
+        if any(json_patch.is_prefix(path, '/title') for path in paths):
+            record.write({'config': config})
+        else:
+            with self.env.protecting([self._fields['name']], self):
+                record.write({'config': config})
+        return True
+
+    def _index_references(self):
+        """Rebuild the component references of these pages, walking their config once."""
+        if not self:
+            return
+        self.env.cr.execute("DELETE FROM odash_config_reference WHERE page_id IN %s", (tuple(self.ids),))
+        for page in self.filtered('is_page_config'):
+            references = extract_references(page.config)
+            if references:
+                self.env.cr.execute("""
+                    INSERT INTO odash_config_reference (page_id, reference)
+                    SELECT %s, unnest(%s::varchar[])
+                    ON CONFLICT DO NOTHING
+                """, (page.id, list(references)))
+
     def clean_unused_config(self):
-        all_configs = self.env['odash.config'].sudo().search([])
-        pages = all_configs.filtered(lambda c: c.is_page_config)
-        configs = all_configs.filtered(lambda c: not c.is_page_config)
+        """
+        Delete the components (data configs) no page references anymore.
+        The reference index only rules out the components it knows to be used:
+        the others are deleted only if their config_id appears nowhere in the
+        page configs, so that ids embedded in longer strings are kept.
+        """
+        self.env['odash.config'].flush_model(['is_page_config', 'config_id', 'config'])
+        self.env.cr.execute("""
+            SELECT component.id
+            FROM odash_config component
+            WHERE NOT component.is_page_config
+              AND component.config_id IS NOT NULL
+              AND NOT EXISTS (
+                  SELECT 1 FROM odash_config_reference reference
+                  WHERE reference.reference = component.config_id
+              )
+              AND NOT EXISTS (
+                  SELECT 1 FROM odash_config page
+                  WHERE page.is_page_config
+                    AND position(component.config_id in page.config::text) > 0
+              )
+        """)
+        unused_ids = [row[0] for row in self.env.cr.fetchall()]
+        self.env['odash.config'].sudo().browse(unused_ids).unlink()
 
-        total_pages = " ".join([json.dumps(page.config) for page in pages])
+    @api.model
+    def get_config_versions(self, config_ids):
+        """
+        Return {id: (revision, category id, last modification)} for the given configs,
+        the last modification including the one of their category.
+        """
+        if not config_ids:
+            return {}
+        self.flush_model(['revision', 'category_id', 'write_date'])
+        self.env['odash.category'].flush_model(['write_date'])
+        self.env.cr.execute("""
+            SELECT config.id, config.revision, config.category_id, GREATEST(config.write_date, category.write_date)
+            FROM odash_config config
+            LEFT JOIN odash_category category ON category.id = config.category_id
+            WHERE config.id IN %s
+        """, (tuple(config_ids),))
+        return {row[0]: row[1:] for row in self.env.cr.fetchall()}
 
-        unused_config = self.env['odash.config'].sudo()
-        for config in configs:
-            if config.config_id not in total_pages:
-                unused_config += config
-        unused_config.unlink()
+    @api.model
+    def get_render_revisions(self, page_ids):
+        """
+        Return {page id: revisions} for the given pages, the revisions of a page
+        being a string changing whenever the page or one of its components changes.
+        """
+        if not page_ids:
+            return {}
+        self.flush_model(['revision', 'config_id', 'is_page_config'])
+        self.env.cr.execute("""
+            SELECT page.id, page.revision,
+                   string_agg(component.id || ':' || component.revision, ',' ORDER BY component.id)
+            FROM odash_config page
+            LEFT JOIN odash_config_reference ref ON ref.page_id = page.id
+            LEFT JOIN odash_config component
+                   ON component.config_id = ref.reference AND NOT component.is_page_config
+            WHERE page.id IN %s
+            GROUP BY page.id, page.revision
+        """, (tuple(page_ids),))
+        return {page_id: f"{revision}/{components or ''}" for page_id, revision, components in self.env.cr.fetchall()}
+
+    @api.model
+    def get_page_index(self, page_ids):
+        """
+        Return the summary of the given pages (id, title, sequence, category and
+        last modification), in the order of `page_ids`, without loading their config.
+        """
+        if not page_ids:
+            return []
+        self.flush_model(['config_id', 'name', 'sequence', 'category_id', 'write_date'])
+        self.env['odash.category'].flush_model(['name'])
+        self.env.cr.execute("""
+            SELECT page.id, page.config_id, page.name, page.sequence, page.category_id,
+                   COALESCE(category.name->>%s, category.name->>'en_US'), page.write_date
+            FROM odash_config page
+            LEFT JOIN odash_category category ON category.id = page.category_id
+            WHERE page.id IN %s
+        """, (self.env.lang or 'en_US', tuple(page_ids)))
+        rows = {row[0]: row[1:] for row in self.env.cr.fetchall()}
+        result = []
+        for page_id in page_ids:
+            if page_id not in rows:
+                continue
+            config_id, name, sequence, category_id, category_name, write_date = rows[page_id]
+            result.append({
+                'id': config_id,
+                'title': name,
+                'sequence': sequence,
+                'category_id': category_id,
+                'category_name': category_name,
+                'write_date': write_date,
+            })
+        return result
 
     @api.depends('access_token')
     def _compute_public_url(self):
@@ -61,6 +273,11 @@ class OdashConfig(models.Model):
         for record in self:
             record.name = record.config.get("title", _("Unnamed"))
 
+    @api.depends('security_group_ids', 'user_ids')
+    def _compute_is_restricted(self):
+        for record in self:
+            record.is_restricted = bool(record.security_group_ids or record.user_ids)
+
     @api.depends('security_group_ids', 'user_ids')
     def _compute_access_summary(self):
         for record in self:
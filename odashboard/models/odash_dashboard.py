@@ -7,6 +7,8 @@ from datetime import datetime
 
 from odoo import models, fields, api
 
+from .ir_http import invalidate_token_cache
+
 
 def generate_random_string(n):
     characters = string.ascii_letters + string.digits
@@ -42,11 +44,27 @@ class Dashboard(models.Model):
     page_id = fields.Many2one("odash.config", string="Page")
 
     connection_url = fields.Char(string="URL")
-    token = fields.Char(string="Token")
+    token = fields.Char(string="Token", index=True)
     config = fields.Json(string="Config")
 
     last_authentication_date = fields.Datetime(string="Last Authentication Date")
 
+    def write(self, vals):
+        if {'token', 'user_id', 'page_id'} & set(vals):
+            self._invalidate_token_cache()
+        return super().write(vals)
+
+    def unlink(self):
+        self._invalidate_token_cache()
+        return super().unlink()
+
+    def _invalidate_token_cache(self):
+        """
+        Forget the authentication cached for the tokens of these dashboards in this
+        worker; the other workers check the dashboard row before using theirs.
+        """
+        invalidate_token_cache(self.env.cr.dbname, self.sudo().mapped('token'))
+
     @api.model
     def update_auth_token(self):
         uuid_param = self.env['ir.config_parameter'].sudo().get_param('odashboard.uuid')
@@ -3,11 +3,98 @@ import logging
 import requests
 import ast
 import hashlib
+import json
+import threading
+import types
+import zlib
 
-from odoo.exceptions import ValidationError
+from psycopg2 import errors as pg_errors
+
+from odoo.exceptions import AccessError, UserError, ValidationError
+
+from ..tools.cache import LRUCache
+from ..tools.serialization import json_default
+from ..tools.single_flight import SingleFlight
 
 _logger = logging.getLogger(__name__)
 
+# Engine namespaces compiled and executed once per worker process, keyed by
+# (database, engine version, sha256 of the code, 'code' | 'previous_code').
+_namespace_cache = {}
+_namespace_lock = threading.RLock()
+
+# sha256 of the engine code, keyed by (database, engine id, code field) with the
+# (write_date, version, code length) it was computed for
+_code_hash_cache = {}
+
+# Action tables resolved for dispatch, keyed like the namespaces (without code field).
+# Values are action -> config dicts, None marking actions unknown to the engine.
+_manifest_cache = {}
+MANIFEST_MAX_ACTIONS = 1024
+
+# Action configurations used when the engine does not define an action itself.
+# Same format as the engine's get_action_config(): see _build_engine_args().
+LEGACY_ACTION_CONFIGS = {
+    'get_models': {
+        'method': 'get_models',
+        'args': ['env'],
+    },
+    'get_model_fields': {
+        'method': 'get_model_fields',
+        'args': ['model_name', 'env'],
+        'required_params': ['model_name'],
+    },
+    'get_model_records': {
+        'method': 'get_model_records',
+        'args': ['model_name', 'parameters', 'env'],
+        'required_params': ['model_name'],
+    },
+    'get_model_search': {
+        'method': 'get_model_search',
+        'args': ['model_name', 'parameters', 'request'],
+        'required_params': ['model_name'],
+    },
+    'process_dashboard_request': {
+        'method': 'process_dashboard_request',
+        'args': [{'param': 'request_data'}, 'env'],
+        'required_params': ['request_data'],
+    },
+}
+
+
+def clear_engine_namespaces(dbname=None):
+    """Drop the cached engine namespaces of a database (or of all databases)."""
+    with _namespace_lock:
+        for key in list(_namespace_cache):
+            if dbname is None or key[0] == dbname:
+                del _namespace_cache[key]
+        for key in list(_manifest_cache):
+            if dbname is None or key[0] == dbname:
+                del _manifest_cache[key]
+        for key in list(_code_hash_cache):
+            if dbname is None or key[0] == dbname:
+                del _code_hash_cache[key]
+
+# Results of cacheable actions, shared by the threads of this worker process.
+# Entries remember the version of every model they read, see odash.change.tracker.
+_result_cache = LRUCache(max_size=64 * 1024 * 1024, ttl=300)
+CACHED_ACTIONS = ('process_dashboard_request',)
+# Engine metadata, only cached in the shared cache and invalidated by module updates
+METADATA_ACTIONS = ('get_models', 'get_model_fields')
+# Read-only actions whose concurrent identical requests are computed only once
+COALESCED_ACTIONS = CACHED_ACTIONS + METADATA_ACTIONS + ('get_model_records', 'get_model_search')
+# Record listings are only coalesced within the worker: their large results are not
+# worth publishing in the shared cache for the other workers
+LOCAL_FLIGHT_ACTIONS = ('get_model_records', 'get_model_search')
+# Actions paginated natively with keyset cursors when a `cursor` parameter is given, see odash.record.reader
+KEYSET_ACTIONS = ('get_model_records', 'get_model_search')
+# Incremental change feed of a model, served natively by odash.record.reader
+CHANGES_ACTION = 'get_model_changes'
+_single_flight = SingleFlight()
+# Keys of the request data naming the models a widget reads
+REQUEST_MODEL_KEYS = ('model', 'model_name', 'res_model')
+# Cached payloads smaller than this are never compressed
+COMPRESS_MIN_SIZE = 1024
 
 class DashboardEngine(models.Model):
     """
@@ -27,6 +114,8 @@ class DashboardEngine(models.Model):
                                help="Previous version of the engine code (for fallback)")
     update_log = fields.Text(string='Update Log', readonly=True,
                             help="Log of update attempts and results")
+    action_manifest = fields.Json(string='Action Manifest', readonly=True,
+                                  help="Action table (method, args, required_params) extracted from the engine code")
 
     @api.model
     def _get_github_base_url(self):
@@ -128,6 +217,8 @@ class DashboardEngine(models.Model):
                 message = f"Already at the latest version ({latest_version})"
                 _logger.info(message)
                 self._add_to_log(message)
+                if not engine._is_action_manifest_current():
+                    engine._store_action_manifest()
                 return False
             
             # Get version details
@@ -189,6 +280,9 @@ class DashboardEngine(models.Model):
                 'version': new_version,
             })
             
+            clear_engine_namespaces(self.env.cr.dbname)
+            engine._store_action_manifest()
+
             message = f"Successfully updated to version {new_version}: {version_info.get('description', 'No description')}"
             _logger.info(message)
             self._add_to_log(message)
@@ -200,11 +294,164 @@ class DashboardEngine(models.Model):
             self._add_to_log(message)
             return False
 
+    def _get_engine_cache_key(self, code_field='code'):
+        """
+        Return the (database, version, code sha256, code field) key of the per-worker
+        caches. The hash is only computed again when the engine was written.
+        """
+        self.ensure_one()
+        code = self[code_field] or ''
+        # Several writes in a transaction share their write_date, the version and length may not
+        stamp = (self.write_date, self.version, len(code))
+        hash_key = (self.env.cr.dbname, self.id, code_field)
+        cached = _code_hash_cache.get(hash_key)
+        if cached is None or cached[0] != stamp:
+            cached = _code_hash_cache[hash_key] = (stamp, hashlib.sha256(code.encode('utf-8')).hexdigest())
+        return (self.env.cr.dbname, self.version, cached[1], code_field)
+
+    def _get_engine_namespace(self, code_field='code'):
+        """
+        Return the namespace obtained by executing the engine code stored in
+        `code_field` ('code' or 'previous_code').
+        The code is only compiled and executed once per worker process; later
+        calls reuse the cached namespace as long as version and code are unchanged.
+        """
+        self.ensure_one()
+        code = self[code_field]
+        key = self._get_engine_cache_key(code_field)
+        namespace = _namespace_cache.get(key)
+        if namespace is not None:
+            return namespace
+
+        with _namespace_lock:
+            # Double-check: another thread may have executed the code meanwhile
+            namespace = _namespace_cache.get(key)
+            if namespace is None:
+                namespace = {}
+                exec(compile(code, f'<odash.engine {self.version} {code_field}>', 'exec'), namespace, namespace)
+                # Only keep the latest namespace per database and code field
+                for stale_key in [k for k in _namespace_cache if k[0] == key[0] and k[3] == code_field]:
+                    del _namespace_cache[stale_key]
+                _namespace_cache[key] = namespace
+        return namespace
+
+    def _extract_action_manifest(self):
+        """
+        Extract the full action table from the current engine code.
+        Uses the engine's get_action_configs() when available, otherwise probes
+        get_action_config() for every public function and legacy action.
+        Returns a dict action -> {'method', 'args', 'required_params'}.
+        """
+        self.ensure_one()
+        namespace = self._get_engine_namespace('code')
+        manifest = {}
+
+        if callable(namespace.get('get_action_configs')):
+            result = namespace['get_action_configs']()
+            configs = result.get('data', {}) if isinstance(result, dict) and 'success' in result else result
+            items = (configs or {}).items()
+        elif callable(namespace.get('get_action_config')):
+            candidates = set(LEGACY_ACTION_CONFIGS)
+            candidates.update(
+                name for name, value in namespace.items()
+                if isinstance(value, types.FunctionType) and not name.startswith('_')
+            )
+            items = []
+            for action in sorted(candidates):
+                result = namespace['get_action_config'](action)
+                if isinstance(result, dict) and result.get('success'):
+                    items.append((action, result.get('data') or {}))
+        else:
+            items = []
+
+        for action, config in items:
+            manifest[action] = {
+                'method': config.get('method', action),
+                'args': config.get('args', []),
+                'required_params': config.get('required_params', []),
+            }
+        return manifest
+
+    def _is_action_manifest_current(self):
+        """Check whether the stored action manifest was extracted from the current code."""
+        self.ensure_one()
+        stored = self.action_manifest or {}
+        return bool(self.code) and stored.get('code_sha256') == self._get_engine_cache_key('code')[2]
+
+    def _store_action_manifest(self):
+        """Extract the engine action table and persist it on the engine record."""
+        self.ensure_one()
+        if not self.code:
+            return False
+        try:
+            actions = self._extract_action_manifest()
+        except Exception as e:
+            message = f"Error extracting action manifest: {str(e)}"
+            _logger.exception(message)
+            self._add_to_log(message)
+            return False
+
+        self.action_manifest = {
+            'version': self.version,
+            'code_sha256': self._get_engine_cache_key('code')[2],
+            'actions': actions,
+        }
+        self._add_to_log(f"Action manifest extracted: {len(actions)} actions")
+        return True
+
+    def _get_action_manifest(self):
+        """
+        Return the in-memory action table of the current engine code.
+        Loaded from the stored manifest when it matches the code, extracted otherwise.
+        """
+        self.ensure_one()
+        if not self.code:
+            return {}
+        key = self._get_engine_cache_key('code')[:3]
+        manifest = _manifest_cache.get(key)
+        if manifest is not None:
+            return manifest
+
+        with _namespace_lock:
+            manifest = _manifest_cache.get(key)
+            if manifest is None:
+                if self._is_action_manifest_current():
+                    manifest = dict(self.action_manifest.get('actions') or {})
+                else:
+                    try:
+                        manifest = self._extract_action_manifest()
+                    except Exception as e:
+                        _logger.exception(f"Error extracting action manifest: {str(e)}")
+                        manifest = {}
+                for stale_key in [k for k in _manifest_cache if k[0] == key[0]]:
+                    del _manifest_cache[stale_key]
+                _manifest_cache[key] = manifest
+        return manifest
+
+    def _get_action_config(self, action):
+        """
+        Resolve the configuration of an action from the in-memory manifest.
+        Actions missing from the manifest are asked once to the engine, then remembered.
+        Returns None when the engine does not define the action.
+        """
+        manifest = self._get_action_manifest()
+        if action in manifest:
+            return manifest[action]
+
+        config = None
+        engine_config = self.execute_engine_code('get_action_config', action)
+        if isinstance(engine_config, dict) and engine_config.get('success'):
+            config = engine_config.get('data', {})
+        if len(manifest) < MANIFEST_MAX_ACTIONS:
+            manifest[action] = config
+        return config
+
     def execute_engine_code(self, method_name, *args, **kwargs):
         """
         Execute a method from the engine code.
         If execution fails, fall back to the previous version.
-        In development mode, it will try to load code from the local file system first.
+        The engine code is executed once per worker and its namespace cached,
+        see _get_engine_namespace().
         """
         self.ensure_one()
         engine = self
@@ -216,10 +463,8 @@ class DashboardEngine(models.Model):
         
         # Try to execute the current code
         try:
-            shared_namespace = {}
-            
-            # Execute the code in the shared namespace
-            exec(code, shared_namespace, shared_namespace)
+            shared_namespace = engine._get_engine_namespace('code')
+
             # Check if the method exists in the namespace
             if method_name in shared_namespace:
                 func = shared_namespace[method_name]
@@ -237,11 +482,7 @@ class DashboardEngine(models.Model):
                 try:
                     _logger.info(f"Attempting fallback execution of '{method_name}'")
                     
-                    # Create a shared namespace for fallback
-                    fallback_namespace = {}
-                    
-                    # Execute the previous code with shared namespace
-                    exec(engine.previous_code, fallback_namespace, fallback_namespace)
+                    fallback_namespace = engine._get_engine_namespace('previous_code')
                     
                     # Check if the method exists in the fallback namespace
                     if method_name in fallback_namespace:
@@ -278,42 +519,324 @@ class DashboardEngine(models.Model):
             dict: Standardized response with 'success', 'data', and 'error' keys
         """
         self.ensure_one()
+
+        if action in KEYSET_ACTIONS and 'cursor' in parameters:
+            return self._execute_keyset_request(action, parameters, env)
+        if action == CHANGES_ACTION:
+            return self._execute_changes_request(parameters, env)
+        if action in CACHED_ACTIONS and self.code:
+            return self._execute_cached_request(action, parameters, env, request)
+        if action in METADATA_ACTIONS and self.code:
+            return self._execute_metadata_request(action, parameters, env, request)
+        if action in COALESCED_ACTIONS and self.code:
+            key = self._get_result_cache_key(action, parameters, env)
+            return self._execute_single_flight(
+                key, lambda: self._execute_unified_request(action, parameters, env, request),
+                across_workers=action not in LOCAL_FLIGHT_ACTIONS)
+        return self._execute_unified_request(action, parameters, env, request)
+
+    def _execute_keyset_request(self, action, parameters, env):
+        """
+        Read one page of records with keyset pagination instead of offset/limit:
+        the `cursor` parameter is empty for the first page, then the `next_cursor`
+        of the previous page. The sort (`order`) may use any stored scalar field.
+        Returns {'records': [...], 'next_cursor': ...} as data.
+        """
+        default_fields = ['display_name'] if action == 'get_model_search' else None
+        return self._execute_record_reader(
+            action, parameters,
+            lambda model_name: env['odash.record.reader'].read_page(model_name, parameters, default_fields))
+
+    def _execute_changes_request(self, parameters, env):
+        """
+        Return the records of a model created or modified since the `since` cursor
+        and matching the domain, and the ids deleted or that left the domain, so
+        that table widgets update in place. See odash.record.reader.read_changes().
+        """
+        return self._execute_record_reader(
+            CHANGES_ACTION, parameters,
+            lambda model_name: env['odash.record.reader'].read_changes(model_name, parameters))
+
+    def _execute_record_reader(self, action, parameters, read):
+        """Run `read(model_name)` and standardize its result or error."""
+        model_name = parameters.get('model_name')
+        if not model_name:
+            return {'success': False, 'error': _("Missing required parameter: %s") % 'model_name'}
+        try:
+            data = read(model_name)
+        except (UserError, AccessError) as e:
+            return {'success': False, 'error': str(e)}
+        except Exception as e:
+            _logger.exception("Error in %s request: %s", action, e)
+            return {'success': False, 'error': str(e)}
+        return {'success': True, 'data': data}
+
+    def _get_result_cache_settings(self):
+        """Read the result cache settings: TTL in seconds (0 disables), size budget in bytes, compression."""
+        config = self.env['ir.config_parameter'].sudo()
+        return {
+            'ttl': int(config.get_param('odashboard.cache.ttl', 300)),
+            'max_size': int(config.get_param('odashboard.cache.max_size', 64 * 1024 * 1024)),
+            'compress': tools.str2bool(config.get_param('odashboard.cache.compress', 'False')),
+            'metadata_ttl': int(config.get_param('odashboard.cache.metadata_ttl', 3600)),
+            'flight_timeout': float(config.get_param('odashboard.single_flight.timeout', 30)),
+        }
+
+    def _get_request_models(self, parameters, env):
+        """Return the names of the models read by a dashboard request."""
+        models_read = set()
+        stack = [parameters.get('request_data')]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, dict):
+                for key, item in value.items():
+                    if key in REQUEST_MODEL_KEYS and isinstance(item, str):
+                        if item in env:
+                            models_read.add(item)
+                    elif isinstance(item, (dict, list)):
+                        stack.append(item)
+            elif isinstance(value, list):
+                stack.extend(value)
+        return models_read
+
+    def _get_request_company_ids(self, env):
+        """Companies the request reads: those allowed on the dashboard, or the environment's."""
+        dashboard = env.context.get('dashboard_id')
+        return sorted(dashboard.allowed_company_ids.ids if dashboard else env.companies.ids)
+
+    def _get_result_cache_key(self, action, parameters, env):
+        """Cache key of a request: engine code, normalized parameters, user, allowed companies and lang."""
+        key_data = {
+            'engine': self._get_engine_cache_key('code')[2],
+            'action': action,
+            'parameters': parameters,
+            'uid': env.uid,
+            'company_ids': self._get_request_company_ids(env),
+            'lang': env.lang,
+        }
+        normalized = json.dumps(key_data, sort_keys=True, default=json_default)
+        return (env.cr.dbname, hashlib.sha256(normalized.encode('utf-8')).hexdigest())
+
+    def _execute_cached_request(self, action, parameters, env, request=None):
+        """
+        Execute a request through the result caches: the per-worker cache first,
+        then the cache shared by all workers (odash.shared.cache).
+        The result is flagged with 'cache': 'hit' or 'miss'. Cached entries expire
+        after the configured TTL, and as soon as a record of a model they read is
+        created, written or unlinked: they store the versions of those models
+        (odash.change.tracker) and are only used while they are still current.
+        """
+        settings = self._get_result_cache_settings()
+        models_read = self._get_request_models(parameters, env)
+        if not settings['ttl'] or not models_read:
+            return self._execute_unified_request(action, parameters, env, request)
+
+        if _result_cache.max_size != settings['max_size']:
+            _result_cache.configure(max_size=settings['max_size'])
+
+        tracker = self.env['odash.change.tracker']
+        tracker.watch_models(models_read)
+        company_ids = self._get_request_company_ids(env)
+        versions = tracker.get_versions(models_read, company_ids)
+
+        key = self._get_result_cache_key(action, parameters, env)
+        entry = _result_cache.get(key)
+        if entry is not None:
+            entry_versions, payload, compressed = entry
+            if entry_versions == versions:
+                result = json.loads(zlib.decompress(payload) if compressed else payload)
+                result['cache'] = 'hit'
+                return result
+            _result_cache.pop(key)
+
+        shared_cache = self.env['odash.shared.cache']
+        shared_key = f"result:{key[1]}"
+        entry = shared_cache.get(shared_key)
+        if entry is not None and entry.get('versions') == versions:
+            result = entry['result']
+            self._store_cached_result(key, versions, result, settings)
+            result['cache'] = 'hit'
+            return result
+
+        def compute():
+            # Versions read in the snapshot the result is computed from, shared with it
+            computed_versions = tracker.get_versions(models_read, company_ids)
+            result = self._execute_unified_request(action, parameters, env, request)
+            if result.get('success'):
+                result = dict(result, versions=computed_versions)
+            return result
+
+        result = self._execute_single_flight(key, compute)
+        result_versions = result.pop('versions', None)
+
+        if result.get('success') and result_versions is not None:
+            self._store_cached_result(key, result_versions, result, settings)
+            shared_cache.set(shared_key, {'versions': result_versions, 'result': result},
+                             ttl=settings['ttl'])
+
+        result['cache'] = 'miss'
+        return result
+
+    def _store_cached_result(self, key, versions, result, settings):
+        """Store a result in the per-worker cache."""
+        payload = json.dumps(result, default=json_default).encode('utf-8')
+        compressed = settings['compress'] and len(payload) >= COMPRESS_MIN_SIZE
+        if compressed:
+            payload = zlib.compress(payload, 1)
+        _result_cache.set(key, (versions, payload, compressed), size=len(payload), ttl=settings['ttl'])
+
+    def _execute_metadata_request(self, action, parameters, env, request=None):
+        """
+        Execute a metadata request (models, fields) through the shared cache.
+        The key includes the registry sequence, which changes with every module update.
+        """
+        settings = self._get_result_cache_settings()
+        if not settings['metadata_ttl']:
+            return self._execute_unified_request(action, parameters, env, request)
+
+        key = self._get_result_cache_key(action, parameters, env)
+        shared_cache = self.env['odash.shared.cache']
+        shared_key = f"metadata:{env.registry.registry_sequence}:{key[1]}"
+
+        result = shared_cache.get(shared_key)
+        if result is not None:
+            result['cache'] = 'hit'
+            return result
+
+        result = self._execute_single_flight(
+            key, lambda: self._execute_unified_request(action, parameters, env, request))
+        if result.get('success'):
+            shared_cache.set(shared_key, result, ttl=settings['metadata_ttl'])
+
+        result['cache'] = 'miss'
+        return result
+
+    def _execute_single_flight(self, key, compute, across_workers=True):
+        """
+        Compute the result of the request identified by `key` only once for all
+        its concurrent duplicates: in this worker, threads wait for the first one;
+        across workers (unless `across_workers` is False), see _execute_across_workers().
+        Waiting is bounded by odashboard.single_flight.timeout, after which the
+        result is computed locally.
+        """
+        timeout = self._get_result_cache_settings()['flight_timeout']
+        if timeout <= 0:
+            return compute()
+        result, shared = _single_flight.do(
+            key,
+            (lambda: self._execute_across_workers(key, compute, timeout)) if across_workers else compute,
+            timeout,
+            shareable=lambda result: result.get('success'),
+        )
+        # Callers flag the result they get, never share the same dict
+        return dict(result) if shared else result
+
+    def _execute_across_workers(self, key, compute, timeout):
+        """
+        Coalesce identical requests across workers with a PostgreSQL advisory lock
+        on the request key, taken on the request cursor (no other connection is
+        held while computing):
+
+        - the worker getting the lock holds it while it computes the result only
+          (session lock, not released with the transaction: a batch does not keep
+          it for its other items) and, only if other workers are waiting for it,
+          publishes the result in the shared cache under a key including its
+          transaction id (pg_locks.virtualtransaction);
+        - the others note the transaction holding the lock, wait for its release,
+          and read the result published by that transaction. A leader that failed
+          publishes nothing: they compute the result themselves, as they do when
+          the wait times out or is cancelled.
+        """
+        cr = self.env.cr
+        lock_id = int.from_bytes(bytes.fromhex(key[1][:16]), 'big', signed=True)
+        # pg_locks shows a bigint advisory lock as two oids
+        lock_key = lock_id & 0xFFFFFFFFFFFFFFFF
+        lock_oids = (lock_key >> 32, lock_key & 0xFFFFFFFF)
+        shared_cache = self.env['odash.shared.cache']
+
+        cr.execute("SELECT pg_try_advisory_lock(%s)", (lock_id,))
+        if cr.fetchone()[0]:
+            try:
+                # An error rolls back to the savepoint, so that the lock can still be released
+                with cr.savepoint() as savepoint:
+                    result = compute()
+                    if not result.get('success'):
+                        savepoint.rollback()
+                        self.env.invalidate_all()
+                if result.get('success'):
+                    cr.execute("""
+                        SELECT held.virtualtransaction, EXISTS (
+                            SELECT 1 FROM pg_locks waiting
+                            WHERE waiting.locktype = 'advisory' AND waiting.classid = %s::oid
+                              AND waiting.objid = %s::oid AND waiting.objsubid = 1 AND NOT waiting.granted
+                        )
+                        FROM pg_locks held
+                        WHERE held.locktype = 'advisory' AND held.classid = %s::oid AND held.objid = %s::oid
+                          AND held.objsubid = 1 AND held.granted AND held.pid = pg_backend_pid()
+                    """, (*lock_oids, *lock_oids))
+                    row = cr.fetchone()
+                    if row and row[1]:
+                        shared_cache.set(f"flight:{key[1]}:{row[0]}", result, ttl=max(int(timeout), 1) * 2)
+            finally:
+                cr.execute("SELECT pg_advisory_unlock(%s)", (lock_id,))
+            return result
+
+        cr.execute("""
+            SELECT virtualtransaction FROM pg_locks
+            WHERE locktype = 'advisory' AND classid = %s::oid AND objid = %s::oid
+              AND objsubid = 1 AND granted AND mode = 'ExclusiveLock'
+        """, lock_oids)
+        row = cr.fetchone()
+        if not row:
+            # The leader is already done
+            return compute()
+        flight_key = f"flight:{key[1]}:{row[0]}"
+
+        try:
+            # A failed wait only rolls back the savepoint, not the request transaction
+            with cr.savepoint():
+                cr.execute("SELECT current_setting('lock_timeout')")
+                lock_timeout = cr.fetchone()[0]
+                cr.execute("SELECT set_config('lock_timeout', %s, true)", (f"{int(timeout * 1000)}ms",))
+                cr.execute("SELECT pg_advisory_lock_shared(%s)", (lock_id,))
+                cr.execute("SELECT pg_advisory_unlock_shared(%s)", (lock_id,))
+                cr.execute("SELECT set_config('lock_timeout', %s, true)", (lock_timeout,))
+        except (pg_errors.LockNotAvailable, pg_errors.DeadlockDetected, pg_errors.QueryCanceled) as e:
+            _logger.info("Could not wait for a concurrent identical request (%s), computing it locally",
+                         type(e).__name__)
+            return compute()
+
+        result = shared_cache.get(flight_key, fresh=True)
+        return result if result is not None else compute()
+
+    def _execute_unified_request(self, action, parameters, env, request=None):
+        """Dispatch a unified request to the engine, see execute_unified_request()."""
+        self.ensure_one()
         
         try:
-            # First, try to get action configuration from the engine itself
-            # This allows the engine to define its own action mappings
-            engine_config = self.execute_engine_code('get_action_config', action)
-            
-            if engine_config and engine_config.get('success'):
-                # Engine provides action configuration
-                config = engine_config.get('data', {})
-                method_name = config.get('method', action)
-                
-                # Build arguments based on engine configuration
-                args = self._build_engine_args(config, parameters, env, request)
-                
-                # Validate parameters if engine specifies requirements
-                validation_error = self._validate_engine_parameters(config, parameters)
-                if validation_error:
-                    return validation_error
-                    
-            else:
+            # Resolve the action configuration defined by the engine itself,
+            # this allows the engine to define its own action mappings
+            config = self._get_action_config(action)
+
+            if config is None:
                 # Fallback to legacy action mapping for backward compatibility
-                legacy_config = self._get_legacy_action_config(action, parameters, env, request)
-                if not legacy_config:
+                config = self._get_legacy_action_config(action)
+                if not config:
                     return {
                         'success': False,
                         'error': _("Unsupported action: %s") % action
                     }
-                
-                method_name = legacy_config['method']
-                args = legacy_config['args']
-                
-                # Legacy parameter validation
-                validation_error = self._validate_legacy_parameters(action, parameters)
-                if validation_error:
-                    return validation_error
-            
+
+            method_name = config.get('method', action)
+
+            # Validate parameters if the configuration specifies requirements
+            validation_error = self._validate_engine_parameters(config, parameters)
+            if validation_error:
+                return validation_error
+
+            # Build arguments based on the configuration
+            args = self._build_engine_args(config, parameters, env, request)
+
             # Execute the engine method
             result = self.execute_engine_code(method_name, *args)
             
@@ -363,41 +886,9 @@ class DashboardEngine(models.Model):
         
         return None
 
-    def _get_legacy_action_config(self, action, parameters, env, request):
+    def _get_legacy_action_config(self, action):
         """Get legacy action configuration for backward compatibility."""
-        legacy_map = {
-            'get_models': {
-                'method': 'get_models',
-                'args': [env]
-            },
-            'get_model_fields': {
-                'method': 'get_model_fields', 
-                'args': [parameters.get('model_name'), env]
-            },
-            'get_model_records': {
-                'method': 'get_model_records',
-                'args': [parameters.get('model_name'), parameters, env]
-            },
-            'get_model_search': {
-                'method': 'get_model_search',
-                'args': [parameters.get('model_name'), parameters, request]
-            },
-            'process_dashboard_request': {
-                'method': 'process_dashboard_request',
-                'args': [parameters.get('request_data', parameters), env]
-            }
-        }
-        
-        return legacy_map.get(action)
-
-    def _validate_legacy_parameters(self, action, parameters):
-        """Validate parameters for legacy actions."""
-        if action in ['get_model_fields', 'get_model_records', 'get_model_search'] and not parameters.get('model_name'):
-            return {'success': False, 'error': _("Missing required parameter: model_name")}
-        elif action == 'process_dashboard_request' and not parameters.get('request_data'):
-            return {'success': False, 'error': _("Missing required parameter: request_data")}
-        
-        return None
+        return LEGACY_ACTION_CONFIGS.get(action)
 
     def _standardize_response(self, result):
         """Standardize engine response format."""
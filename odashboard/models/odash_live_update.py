@@ -0,0 +1,132 @@
+import logging
+from datetime import timedelta
+
+from odoo import fields, models, api
+
+_logger = logging.getLogger(__name__)
+
+# Channel of the changes of records without company, per-company channels are
+# (res.company, BUS_CHANNEL); subscribed to while a dashboard is open only
+BUS_CHANNEL = 'odashboard'
+COMPANY_CHANNEL_PREFIX = 'odashboard_company_'
+NOTIFICATION_TYPE = 'odashboard/model_changed'
+# Notifications are sent at most this often (seconds)
+NOTIFY_INTERVAL = 5
+
+
+class OdashLiveUpdate(models.AbstractModel):
+    """
+    Push "model changed" notifications on the bus, so that open dashboards
+    refetch the affected widgets instead of polling or reloading.
+
+    When records of a model read by dashboards (see odash.change.tracker) are
+    created, written or unlinked, the (model, company) pairs changed are added
+    to odash_live_update_pending once the transaction commits. They are sent at
+    most every NOTIFY_INTERVAL seconds, whatever the number of transactions: on
+    the channel of each company, and on the 'odashboard' channel for records
+    without company. The changes committed while a notification was sent
+    recently are sent by a cron triggered at the end of the interval.
+
+    Browsers only subscribe to those channels while a dashboard is open, and
+    only to the channels of their companies (see ir.websocket).
+    """
+    _name = 'odash.live.update'
+    _description = 'Dashboard Live Update'
+
+    def init(self):
+        # company_id is 0 for records without company
+        self.env.cr.execute("""
+            CREATE UNLOGGED TABLE IF NOT EXISTS odash_live_update_pending (
+                model varchar NOT NULL,
+                company_id integer NOT NULL,
+                PRIMARY KEY (model, company_id)
+            )
+        """)
+        # One row: when the last notification was sent, and whether the cron is triggered
+        self.env.cr.execute("""
+            CREATE TABLE IF NOT EXISTS odash_live_update_state (
+                id integer PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+                sent_at timestamp NOT NULL DEFAULT '-infinity',
+                scheduled boolean NOT NULL DEFAULT false
+            )
+        """)
+        self.env.cr.execute("INSERT INTO odash_live_update_state (id) VALUES (1) ON CONFLICT DO NOTHING")
+
+    @api.model
+    def queue_notification(self, model_name, company_ids):
+        """
+        Queue the change of records of `model_name` (0 in `company_ids` for records
+        without company), sent once the transaction is committed.
+        """
+        changes = self.env.cr.postcommit.data.setdefault('odash.live_changes', set())
+        if not changes:
+            registry = self.env.registry
+
+            @self.env.cr.postcommit.add
+            def send_changes():
+                try:
+                    with registry.cursor() as cr:
+                        live_update = self.with_env(self.env(cr=cr))
+                        live_update._add_pending(changes)
+                        live_update._send_pending()
+                except Exception as e:
+                    # Live updates are best effort
+                    _logger.warning("Could not send dashboard live updates: %s", e)
+        changes.update((model_name, company_id) for company_id in company_ids)
+
+    def _add_pending(self, changes):
+        self.env.cr.execute("""
+            INSERT INTO odash_live_update_pending (model, company_id)
+            SELECT * FROM unnest(%s::varchar[], %s::integer[])
+            ON CONFLICT DO NOTHING
+        """, ([model for model, _company in sorted(changes)],
+              [company for _model, company in sorted(changes)]))
+
+    @api.model
+    def _send_pending(self):
+        """
+        Send the pending changes if no notification was sent during the last
+        NOTIFY_INTERVAL seconds, otherwise trigger the cron to send them at the
+        end of the interval (once).
+        """
+        cr = self.env.cr
+        cr.execute("""
+            UPDATE odash_live_update_state SET sent_at = now() at time zone 'UTC', scheduled = false
+            WHERE sent_at <= (now() at time zone 'UTC') - %s * interval '1 second'
+            RETURNING id
+        """, (NOTIFY_INTERVAL,))
+        if not cr.fetchone():
+            cr.execute("""
+                UPDATE odash_live_update_state SET scheduled = true
+                WHERE NOT scheduled
+                RETURNING sent_at
+            """)
+            row = cr.fetchone()
+            if row:
+                self.env.ref('odashboard.ir_cron_odash_live_update').sudo()._trigger(
+                    at=max(row[0] + timedelta(seconds=NOTIFY_INTERVAL), fields.Datetime.now()))
+            return
+
+        # Changes committed after this statement stay pending for the next notification
+        cr.execute("DELETE FROM odash_live_update_pending RETURNING model, company_id")
+        changes = {}
+        for model_name, company_id in cr.fetchall():
+            changes.setdefault(company_id, set()).add(model_name)
+        bus = self.env['bus.bus'].sudo()
+        companies = self.env['res.company'].sudo().browse([company_id for company_id in changes if company_id])
+        for company in companies.exists():
+            bus._sendone((company, BUS_CHANNEL), NOTIFICATION_TYPE, {'changes': [
+                {'model': model_name, 'company_ids': [company.id]} for model_name in sorted(changes[company.id])
+            ]})
+        if 0 in changes:
+            # Records without company: for any company
+            bus._sendone(BUS_CHANNEL, NOTIFICATION_TYPE, {'changes': [
+                {'model': model_name, 'company_ids': []} for model_name in sorted(changes[0])
+            ]})
+
+    @api.model
+    def cron_send_pending(self):
+        """Cron: send the changes left pending at the end of the notification interval."""
+        # Triggered a bit early, it triggers itself again
+        self.env.cr.execute("UPDATE odash_live_update_state SET scheduled = false")
+        self._send_pending()
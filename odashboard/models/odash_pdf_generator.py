@@ -1,6 +1,10 @@
-import io
 import logging
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
 try:
     from PyPDF2 import PdfReader, PdfWriter
 except ImportError:
@@ -13,6 +17,50 @@ from odoo.exceptions import UserError
 
 _logger = logging.getLogger(__name__)
 
+RENDER_TIMEOUT = 120
+DEFAULT_CONCURRENCY = 4
+# PDF files are kept in memory up to this size, then spooled to disk
+SPOOL_MAX_SIZE = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+
+class PdfRenderError(Exception):
+    """The PDF server could not render a page."""
+
+
+def spooled_file():
+    """Return a temporary binary file, in memory until it grows above SPOOL_MAX_SIZE."""
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+
+
+def render_pdf(session, pdf_server_url, url, timeout=RENDER_TIMEOUT):
+    """
+    Ask the PDF server to render `url`, raise PdfRenderError. Return the PDF as a
+    spooled file positioned at its start, downloaded by chunks.
+    Does not use the database, so it can run in a thread of its own.
+    """
+    try:
+        response = session.post(f"{pdf_server_url}/render", json={"url": url}, timeout=timeout, stream=True)
+    except requests.RequestException as e:
+        raise PdfRenderError(f"PDF service unreachable: {e}")
+
+    with response:
+        if response.status_code != 200:
+            raise PdfRenderError(f"PDF server returned status {response.status_code}")
+        # Check if response is actually PDF content
+        content_type = response.headers.get('Content-Type', '')
+        if not content_type.startswith('application/pdf'):
+            raise PdfRenderError(f"PDF server returned unexpected content type: {content_type}")
+        pdf_file = spooled_file()
+        try:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                pdf_file.write(chunk)
+        except requests.RequestException as e:
+            pdf_file.close()
+            raise PdfRenderError(f"PDF download interrupted: {e}")
+    pdf_file.seek(0)
+    return pdf_file
+
 
 class OdashPdfGenerator(models.AbstractModel):
     _name = 'odash.pdf.generator'
@@ -29,6 +77,16 @@ class OdashPdfGenerator(models.AbstractModel):
         Returns:
             bytes: PDF data
         """
+        with self.generate_dashboard_pdf_file(report_config) as pdf_file:
+            return pdf_file.read()
+
+    @api.model
+    def generate_dashboard_pdf_file(self, report_config):
+        """
+        Generate a PDF report like generate_dashboard_pdf(), as a spooled file
+        positioned at its start, to be closed by the caller. Large reports stay
+        on disk instead of in memory.
+        """
         try:
             # Get pages to include
             pages = report_config.get_pages_to_include()
@@ -41,7 +99,10 @@ class OdashPdfGenerator(models.AbstractModel):
             # Create a merged PDF if multiple pages
             if len(pages) == 1:
                 # Single page - use direct PDF generation
-                return self._generate_single_page_pdf(pages[0], pdf_server_url)
+                page, pdf_file, error = list(self._render_pages(pages, pdf_server_url))[0]
+                if error:
+                    raise UserError(_("Failed to generate PDF for page '%s': %s") % (page.name, error))
+                return pdf_file
             else:
                 # Multiple pages - generate each page and merge
                 return self._generate_multi_page_pdf(pages, pdf_server_url, report_config)
@@ -50,81 +111,132 @@ class OdashPdfGenerator(models.AbstractModel):
             _logger.error(f"Error generating PDF report: {str(e)}")
             raise UserError(_("Failed to generate PDF report: %s") % str(e))
 
+    def _get_page_render_url(self, page):
+        """Return the public URL of a page rendered by the PDF server."""
+        connection_url = self.env['odash.dashboard'].sudo().get_public_dashboard(page.id)
+        return f"{connection_url}&is_pdf=true"
+
+    def _get_render_concurrency(self):
+        return max(1, int(self.env['ir.config_parameter'].sudo().get_param(
+            'odashboard.pdf.concurrency', DEFAULT_CONCURRENCY)))
+
+    def _make_render_session(self, pool_size=1):
+        """Return a requests session keeping up to `pool_size` connections to the PDF server alive."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
     def _generate_single_page_pdf(self, page, pdf_server_url):
         """Generate PDF for a single dashboard page using the existing PDF server"""
+        url = self._get_page_render_url(page)
+        _logger.info(f"Generating PDF for page '{page.name}' using PDF server: {pdf_server_url}")
         try:
-            # Get the public dashboard URL for this page
-            connection_url = self.env['odash.dashboard'].sudo().get_public_dashboard(page.id)
-            
-            # Add PDF parameter to the URL
-            pdf_url = f"{connection_url}&is_pdf=true"
-            
-            # Call the PDF server
-            payload = {"url": pdf_url}
-            
-            _logger.info(f"Generating PDF for page '{page.name}' using PDF server: {pdf_server_url}")
-            
-            response = requests.post(
-                f"{pdf_server_url}/render", 
-                json=payload, 
-                timeout=120
-            )
-            
-            if response.status_code != 200:
-                error_msg = f"PDF server returned status {response.status_code}"
-                _logger.error(f"Error generating PDF for page {page.name}: {error_msg}")
-                raise UserError(_("Failed to generate PDF for page '%s': %s") % (page.name, error_msg))
-            
-            # Check if response is actually PDF content
-            content_type = response.headers.get('Content-Type', '')
-            if not content_type.startswith('application/pdf'):
-                error_msg = f"PDF server returned unexpected content type: {content_type}"
-                _logger.error(f"Error generating PDF for page {page.name}: {error_msg}")
-                raise UserError(_("Failed to generate PDF for page '%s': %s") % (page.name, error_msg))
-            
-            _logger.info(f"Successfully generated PDF for page '{page.name}'")
-            return response.content
-            
-        except requests.RequestException as e:
-            error_msg = f"PDF service unreachable: {str(e)}"
-            _logger.error(f"Error generating PDF for page {page.name}: {error_msg}")
-            raise UserError(_("Failed to generate PDF for page '%s': %s") % (page.name, error_msg))
+            with self._make_render_session() as session, render_pdf(session, pdf_server_url, url) as pdf_file:
+                pdf_data = pdf_file.read()
+        except PdfRenderError as e:
+            _logger.error(f"Error generating PDF for page {page.name}: {e}")
+            raise UserError(_("Failed to generate PDF for page '%s': %s") % (page.name, e))
+
+        _logger.info(f"Successfully generated PDF for page '{page.name}'")
+        return pdf_data
+
+    def _render_pages(self, pages, pdf_server_url):
+        """
+        Render the given pages, reusing the renderings cached in the current
+        freshness window (odash.pdf.render.cache). The other pages are rendered
+        concurrently (odashboard.pdf.concurrency at a time) through one keep-alive
+        session: the database work (public URLs) is done first on the current
+        cursor, the threads only talk to the PDF server. The renderings stop at
+        the time.monotonic() deadline given as `odash_pdf_deadline` in context.
+        Yield, in page order and as soon as available, (page, PDF file or None,
+        error or None), the files being closed by the caller.
+        """
+        render_cache = self.env['odash.pdf.render.cache']
+        cached = render_cache.lookup(pages)
+        missing = pages.filtered(lambda page: page.id not in cached)
+        if not missing:
+            _logger.info(f"PDF of pages {pages.ids} served from the render cache")
+            for page in pages:
+                yield page, cached[page.id], None
+            return
+
+        urls = [self._get_page_render_url(page) for page in missing]
+        concurrency = min(self._get_render_concurrency(), len(missing))
+        timeout = RENDER_TIMEOUT
+        deadline = self.env.context.get('odash_pdf_deadline')
+        if deadline:
+            timeout = max(1, min(timeout, deadline - time.monotonic()))
+
+        def render(url):
+            if deadline and time.monotonic() >= deadline:
+                return None, "Time budget exceeded"
+            try:
+                return render_pdf(session, pdf_server_url, url, timeout), None
+            except PdfRenderError as e:
+                return None, str(e)
+
+        with self._make_render_session(concurrency) as session, \
+                ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='odash_pdf') as executor:
+            rendered = zip(missing, executor.map(render, urls))
+            for page in pages:
+                if page.id in cached:
+                    yield page, cached[page.id], None
+                    continue
+                _page, (pdf_file, error) = next(rendered)
+                if pdf_file:
+                    render_cache.store(page, pdf_file)
+                    pdf_file.seek(0)
+                yield page, pdf_file, error
 
     def _generate_multi_page_pdf(self, pages, pdf_server_url, report_config):
-        """Generate and merge PDFs for multiple dashboard pages"""
+        """
+        Generate and merge PDFs for multiple dashboard pages, rendered concurrently.
+        Each page is appended as soon as it is rendered, read from its spooled file,
+        and the merged PDF is written to a spooled file as well.
+        """
+        pdf_writer = PdfWriter()
+        errors = []
+        # The pages added to the writer are read from their file until the merged PDF is written
+        page_files = []
         try:
-            pdf_writer = PdfWriter()
-            
-            # Generate PDF for each page and merge
-            for i, page in enumerate(pages):
+            # Merge in page order, skipping the pages that failed
+            for page, page_file, error in self._render_pages(pages, pdf_server_url):
+                if error:
+                    _logger.error(f"Error processing page {page.name}: {error}")
+                    errors.append(f"{page.name}: {error}")
+                    continue
+                page_files.append(page_file)
                 try:
-                    # Generate PDF for this page
-                    page_pdf_data = self._generate_single_page_pdf(page, pdf_server_url)
-                    
-                    # Read the PDF data
-                    pdf_reader = PdfReader(io.BytesIO(page_pdf_data))
-                    
-                    # Add all pages from this PDF to the writer
-                    for page_num in range(len(pdf_reader.pages)):
-                        pdf_writer.add_page(pdf_reader.pages[page_num])
-                        
+                    pdf_reader = PdfReader(page_file)
+                    for pdf_page in pdf_reader.pages:
+                        pdf_writer.add_page(pdf_page)
                 except Exception as e:
                     _logger.error(f"Error processing page {page.name}: {str(e)}")
-                    # Continue with other pages even if one fails
-                    continue
-            
-            # Write the merged PDF to a buffer
-            output_buffer = io.BytesIO()
-            pdf_writer.write(output_buffer)
-            
-            # Get the merged PDF data
-            merged_pdf_data = output_buffer.getvalue()
-            output_buffer.close()
+                    errors.append(f"{page.name}: {e}")
+
+            if len(errors) == len(pages):
+                raise UserError(_("No page could be rendered:\n%s") % "\n".join(errors))
+            if errors:
+                report_config.message_post(
+                    body=_("Some pages could not be rendered and were left out of the report:\n%s") % "\n".join(errors))
 
-            return merged_pdf_data
+            # Write the merged PDF to a spooled file
+            merged_file = spooled_file()
+            try:
+                pdf_writer.write(merged_file)
+            except Exception:
+                merged_file.close()
+                raise
+            merged_file.seek(0)
+            return merged_file
             
         except Exception as e:
             raise UserError(_("Failed to merge PDF pages: %s") % str(e))
+        finally:
+            for page_file in page_files:
+                page_file.close()
 
     @api.model
     def test_pdf_generation(self, page_id=None):
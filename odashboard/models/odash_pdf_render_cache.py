@@ -0,0 +1,130 @@
+import hashlib
+import logging
+import time
+from datetime import datetime
+
+import psycopg2
+
+from odoo import fields, models, api
+
+_logger = logging.getLogger(__name__)
+
+# Rendered pages are reused for this long (seconds), 0 disables the cache
+DEFAULT_WINDOW = 3600
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+
+class OdashPdfRenderCache(models.Model):
+    """
+    PDF renderings of dashboard pages, stored in the filestore, so that the
+    reports including the same page render it once per freshness window.
+
+    An entry is keyed by the page, the revisions of the page and its components
+    (see odash.config.get_render_revisions()) and the freshness window the
+    rendering belongs to: editing the page or a component, or entering the next
+    window, makes the next report render the page again. Entries expire at the
+    end of their window, and a cron (gc) removes them and keeps the cache below
+    a size budget, evicting the least recently used entries first.
+    """
+    _name = 'odash.pdf.render.cache'
+    _description = 'Dashboard PDF Render Cache'
+    _order = 'last_access desc'
+
+    key = fields.Char(string='Key', required=True, index=True, readonly=True)
+    page_id = fields.Many2one(comodel_name='odash.config', string='Page', required=True,
+                              ondelete='cascade', readonly=True)
+    datas = fields.Binary(string='PDF', attachment=True, readonly=True)
+    file_size = fields.Integer(string='Size', readonly=True)
+    expires_at = fields.Datetime(string='Expires At', required=True, index=True, readonly=True)
+    last_access = fields.Datetime(string='Last Access', default=fields.Datetime.now, readonly=True)
+
+    _sql_constraints = [
+        ('key_uniq', 'unique(key)', 'A rendering is cached once per key.'),
+    ]
+
+    @api.model
+    def _get_window(self):
+        return int(self.env['ir.config_parameter'].sudo().get_param('odashboard.pdf.cache_window', DEFAULT_WINDOW))
+
+    @api.model
+    def _get_keys(self, pages):
+        """Return ({page id: key}, expiration date) of the renderings of `pages` now."""
+        window = self._get_window()
+        bucket = int(time.time() // window)
+        expires_at = datetime.utcfromtimestamp((bucket + 1) * window)
+        revisions = self.env['odash.config'].get_render_revisions(pages.ids)
+        keys = {
+            page.id: hashlib.sha256(f"{page.id}|{revisions.get(page.id)}|{bucket}".encode()).hexdigest()
+            for page in pages
+        }
+        return keys, expires_at
+
+    @api.model
+    def lookup(self, pages):
+        """
+        Return {page id: PDF file} for the pages of `pages` rendered in the current
+        window, the files (read from the filestore) being closed by the caller.
+        """
+        if not pages or self._get_window() <= 0:
+            return {}
+        keys, _expires_at = self._get_keys(pages)
+        entries = self.sudo().search([
+            ('key', 'in', list(keys.values())),
+            ('expires_at', '>', fields.Datetime.now()),
+        ])
+        if not entries:
+            return {}
+        entries.write({'last_access': fields.Datetime.now()})
+        page_by_key = {key: page_id for page_id, key in keys.items()}
+        attachments = self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', self._name),
+            ('res_field', '=', 'datas'),
+            ('res_id', 'in', entries.ids),
+        ])
+        entry_keys = {entry.id: entry.key for entry in entries}
+        return {page_by_key[entry_keys[attachment.res_id]]: attachment._odash_open() for attachment in attachments}
+
+    @api.model
+    def store(self, page, pdf_file):
+        """Cache the rendering `pdf_file` (binary file) of `page` for the current window."""
+        if self._get_window() <= 0:
+            return
+        keys, expires_at = self._get_keys(page)
+        try:
+            # Another report may have rendered the page meanwhile
+            with self.env.cr.savepoint():
+                entry = self.sudo().create({
+                    'key': keys[page.id],
+                    'page_id': page.id,
+                    'expires_at': expires_at,
+                })
+                attachment = self.env['ir.attachment'].sudo()._odash_create_from_file(pdf_file, {
+                    'name': f"odashboard_page_{page.id}.pdf",
+                    'mimetype': 'application/pdf',
+                    'res_model': self._name,
+                    'res_field': 'datas',
+                    'res_id': entry.id,
+                })
+                entry.file_size = attachment.file_size
+        except psycopg2.IntegrityError:
+            _logger.debug("PDF rendering of page %s already cached", page.id)
+
+    @api.model
+    def gc(self):
+        """Cron: remove the expired renderings, then the least recently used ones above the size budget."""
+        expired = self.sudo().search([('expires_at', '<=', fields.Datetime.now())])
+        expired.unlink()
+
+        max_size = int(self.env['ir.config_parameter'].sudo().get_param(
+            'odashboard.pdf.cache_max_size', DEFAULT_MAX_SIZE))
+        self.flush_model(['file_size', 'last_access'])
+        self.env.cr.execute("""
+            SELECT id FROM (
+                SELECT id, sum(file_size) OVER (ORDER BY last_access DESC, id DESC) AS total
+                FROM odash_pdf_render_cache
+            ) entries
+            WHERE total > %s
+        """, (max_size,))
+        evicted = self.sudo().browse([row[0] for row in self.env.cr.fetchall()])
+        evicted.unlink()
+        _logger.info("PDF render cache: %s expired and %s evicted renderings removed", len(expired), len(evicted))
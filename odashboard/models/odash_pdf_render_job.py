@@ -0,0 +1,131 @@
+import logging
+import time
+import uuid
+from datetime import timedelta
+
+from odoo import fields, models, api
+
+from .odash_pdf_generator import RENDER_TIMEOUT
+
+_logger = logging.getLogger(__name__)
+
+# Jobs processed by one run of the cron, which triggers itself again if more are pending
+JOB_BATCH_SIZE = 10
+# Finished jobs and their PDF are kept this long
+JOB_RETENTION_HOURS = 24
+
+
+class OdashPdfRenderJob(models.Model):
+    """
+    Rendering of a public dashboard page to PDF, done in the background.
+
+    The public PDF endpoint, in asynchronous mode, creates a job and returns at
+    once instead of holding an HTTP worker while the PDF server renders the page.
+    The job cron renders the pending jobs, one transaction per job, and stores the
+    PDF as an attachment, served by the download endpoint once the job is done.
+    """
+    _name = 'odash.pdf.render.job'
+    _description = 'Dashboard PDF Render Job'
+    _order = 'id desc'
+
+    page_id = fields.Many2one(comodel_name='odash.config', string='Page', required=True,
+                              ondelete='cascade', readonly=True)
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='State', required=True, default='pending', index=True, readonly=True)
+    access_token = fields.Char(string='Access token', required=True, readonly=True,
+                               default=lambda self: str(uuid.uuid4()))
+    pdf_file = fields.Binary(string='PDF', attachment=True, readonly=True)
+    error_message = fields.Text(string='Error', readonly=True)
+    date_done = fields.Datetime(string='Done At', readonly=True)
+
+    @api.model
+    def enqueue(self, page):
+        """Return the pending job rendering `page`, creating it and waking up the cron if needed."""
+        job = self.sudo().search([('page_id', '=', page.id), ('state', '=', 'pending')], limit=1)
+        if not job:
+            job = self.sudo().create({'page_id': page.id})
+            self.env.ref('odashboard.ir_cron_odash_pdf_render_jobs').sudo()._trigger()
+        return job
+
+    def get_status(self):
+        """Return the status of the job, as served by the status endpoint."""
+        self.ensure_one()
+        return {
+            'id': self.id,
+            'state': self.state,
+            'error': self.error_message or None,
+            'done_at': self.date_done,
+        }
+
+    def _run(self):
+        """Render the page of the job and store the PDF, or the error."""
+        self.ensure_one()
+        generator = self.env['odash.pdf.generator'].sudo()
+        pdf_server_url = self.env['ir.config_parameter'].sudo().get_param('odashboard.pdf.url', 'https://pdf.odashboard.app')
+        try:
+            _page, pdf_file, error = list(generator._render_pages(self.page_id, pdf_server_url))[0]
+        except Exception as e:
+            pdf_file, error = None, str(e)
+
+        if error:
+            self._set_failed(error)
+            return
+        with pdf_file:
+            self.env['ir.attachment'].sudo()._odash_create_from_file(pdf_file, {
+                'name': f"odashboard_{self.page_id.id}.pdf",
+                'mimetype': 'application/pdf',
+                'res_model': self._name,
+                'res_field': 'pdf_file',
+                'res_id': self.id,
+            })
+        self.write({'state': 'done', 'date_done': fields.Datetime.now()})
+
+    def _set_failed(self, error):
+        self.ensure_one()
+        _logger.error(f"PDF render job {self.id} for page '{self.page_id.name}' failed: {error}")
+        self.write({'state': 'failed', 'error_message': error, 'date_done': fields.Datetime.now()})
+
+    @api.model
+    def cron_process_jobs(self):
+        """
+        Cron: render the pending jobs, committing after each one, until the batch
+        size or the time budget of the run is reached (see odash.pdf.report.job).
+        Jobs are locked with SKIP LOCKED, so that several runs never render the
+        same job; a job raising an error is rolled back to its savepoint and marked
+        failed, so that it never blocks the queue.
+        """
+        cron_budget = self.env['odash.pdf.report.job']._get_cron_time_budget()
+        cron_deadline = time.monotonic() + cron_budget
+        job_budget = min(RENDER_TIMEOUT, cron_budget)
+        for _i in range(JOB_BATCH_SIZE):
+            if time.monotonic() + job_budget > cron_deadline:
+                _logger.info("PDF render jobs: time budget of the run spent")
+                self.env.ref('odashboard.ir_cron_odash_pdf_render_jobs')._trigger()
+                break
+            self.env.cr.execute("""
+                SELECT id FROM odash_pdf_render_job
+                WHERE state = 'pending'
+                ORDER BY id
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            """)
+            row = self.env.cr.fetchone()
+            if not row:
+                break
+            job = self.browse(row[0])
+            try:
+                with self.env.cr.savepoint():
+                    job.with_context(odash_pdf_deadline=time.monotonic() + job_budget)._run()
+            except Exception as e:
+                job._set_failed(str(e))
+            self.env.cr.commit()
+        else:
+            self.env.ref('odashboard.ir_cron_odash_pdf_render_jobs')._trigger()
+
+        self.search([
+            ('state', 'in', ('done', 'failed')),
+            ('date_done', '<', fields.Datetime.now() - timedelta(hours=JOB_RETENTION_HOURS)),
+        ]).unlink()
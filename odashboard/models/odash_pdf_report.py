@@ -1,5 +1,4 @@
 import json
-import base64
 import logging
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
@@ -84,6 +83,8 @@ class OdashPdfReport(models.Model):
     
     # Execution tracking
     last_sent_date = fields.Datetime(string='Last Sent Date', readonly=True)
+    last_failed_date = fields.Datetime(string='Last Failed Date', readonly=True,
+                                       help="When a scheduled sending was given up after its last retry")
     next_send_date = fields.Datetime(string='Next Send Date', compute='_compute_next_send_date', store=True)
     send_count = fields.Integer(string='Send Count', default=0, readonly=True, help="Number of times this report has been sent")
     
@@ -120,7 +121,7 @@ class OdashPdfReport(models.Model):
             if not record.include_all_pages and not record.page_ids:
                 raise ValidationError(_("Either select specific pages or enable 'Include All Pages'."))
 
-    @api.depends('period', 'weekday', 'day_of_month', 'send_time', 'last_sent_date')
+    @api.depends('period', 'weekday', 'day_of_month', 'send_time', 'last_sent_date', 'last_failed_date')
     def _compute_next_send_date(self):
         for record in self:
             if not record.active:
@@ -128,7 +129,8 @@ class OdashPdfReport(models.Model):
                 continue
                 
             now = datetime.now()
-            base_date = record.last_sent_date or now
+            # A sending given up moves the schedule to the next period as well
+            base_date = max(filter(None, [record.last_sent_date, record.last_failed_date]), default=now)
             
             # Calculate next send date based on period
             if record.period == 'daily':
@@ -223,18 +225,10 @@ class OdashPdfReport(models.Model):
         """Generate and download a preview of the PDF report"""
         self.ensure_one()
         try:
-            pdf_data = self._generate_pdf_report()
-            
             # Create attachment for download
             filename = f"{self.name}_preview_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            attachment = self.env['ir.attachment'].create({
-                'name': filename,
-                'type': 'binary',
-                'datas': base64.b64encode(pdf_data),
-                'res_model': self._name,
-                'res_id': self.id,
-                'mimetype': 'application/pdf',
-            })
+            with self._generate_pdf_report() as pdf_file:
+                attachment = self._create_report_attachment(pdf_file, filename)
             
             return {
                 'type': 'ir.actions.act_url',
@@ -246,26 +240,30 @@ class OdashPdfReport(models.Model):
             raise UserError(_('Failed to generate PDF preview: %s') % str(e))
 
     def _generate_pdf_report(self):
-        """Generate the PDF report content"""
+        """Generate the PDF report content, as a spooled file to be closed by the caller"""
         self.ensure_one()
-        return self.env['odash.pdf.generator'].sudo().generate_dashboard_pdf(self)
+        return self.env['odash.pdf.generator'].sudo().generate_dashboard_pdf_file(self)
 
     def _generate_and_send_report(self):
         """Generate PDF and send via email"""
         self.ensure_one()
         
         try:
-            # Generate PDF
-            pdf_data = self._generate_pdf_report()
-            
             # Get recipients
             recipients = self.get_all_recipients()
             if not recipients:
                 raise UserError(_("No valid recipients found for report '%s'") % self.name)
             
-            # Send email to each recipient
+            # Generate PDF, one attachment shared by all the emails
+            with self._generate_pdf_report() as pdf_file:
+                attachment = self._create_report_attachment(pdf_file)
+            
+            # One queued email per language
+            recipients_by_lang = {}
             for recipient in recipients:
-                self._send_email_with_pdf(recipient, pdf_data)
+                recipients_by_lang.setdefault(recipient['lang'], []).append(recipient)
+            for lang, lang_recipients in recipients_by_lang.items():
+                self._send_email_with_pdf(lang_recipients, lang, attachment)
             
             # Update tracking fields
             self.write({
@@ -286,65 +284,64 @@ class OdashPdfReport(models.Model):
             _logger.error(f"Error generating/sending PDF report '{self.name}': {error_msg}")
             raise
 
-    def _send_email_with_pdf(self, recipient, pdf_data):
-        """Send email with PDF attachment to a specific recipient"""
+    def _create_report_attachment(self, pdf_file, filename=None):
+        """Store the generated PDF file as an attachment of the report, streamed to the filestore"""
+        self.ensure_one()
+        if not filename:
+            filename = f"Dashboard_Report_{self.name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        return self.env['ir.attachment']._odash_create_from_file(pdf_file, {
+            'name': filename,
+            'type': 'binary',
+            'res_model': self._name,
+            'res_id': self.id,
+            'mimetype': 'application/pdf',
+        })
+
+    def _send_email_with_pdf(self, recipients, lang, attachment):
+        """
+        Queue the email of the report, in `lang`, to the given recipients: users
+        through their partner, additional addresses in email_to (no contact is
+        created for them). The mail queue sends an individual message to each
+        user, and one message to the additional addresses.
+        """
         self.ensure_one()
+        emails = ', '.join(recipient['email'] for recipient in recipients)
         
         try:
             # Get the email template
             template = self.env.ref('odashboard.mail_template_pdf_report')
             
-            # Create PDF attachment
-            filename = f"Dashboard_Report_{self.name.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            attachment = self.env['ir.attachment'].create({
-                'name': filename,
-                'type': 'binary',
-                'datas': base64.b64encode(pdf_data),
-                'res_model': self._name,
-                'res_id': self.id,
-                'mimetype': 'application/pdf',
-            })
+            partners = self.env['res.users'].browse(
+                [recipient['user_id'] for recipient in recipients if recipient['user_id']]).partner_id
+            email_to = ', '.join(recipient['email'] for recipient in recipients if not recipient['user_id'])
             
             # Prepare email context
             email_context = {
-                'recipient_name': recipient['name'],
-                'recipient_lang': recipient['lang'],
+                'recipient_lang': lang,
             }
             
-            # Send email
+            # Queue email
             template.with_context(email_context).send_mail(
                 self.id,
                 email_values={
-                    'email_to': recipient['email'],
+                    'recipient_ids': [(6, 0, partners.ids)],
+                    'email_to': email_to,
                     'attachment_ids': [(6, 0, [attachment.id])],
                     'email_from': self.env.company.email
                 },
-                force_send=True
+                force_send=False
             )
             
-            _logger.info(f"PDF report sent successfully to {recipient['email']}")
+            _logger.info(f"PDF report queued for {emails}")
             
         except Exception as e:
-            _logger.error(f"Error sending email to {recipient['email']}: {str(e)}")
+            _logger.error(f"Error sending email to {emails}: {str(e)}")
             raise
 
     @api.model
     def cron_send_scheduled_reports(self):
-        """Cron job to send scheduled reports"""
-        now = datetime.now()
-        
-        # Find reports that should be sent now
-        reports_to_send = self.search([
-            ('active', '=', True),
-            ('next_send_date', '<=', now),
-        ])
-        
-        _logger.info(f"Found {len(reports_to_send)} PDF reports to send")
-        
-        for report in reports_to_send:
-            try:
-                report._generate_and_send_report()
-            except Exception as e:
-                _logger.error(f"Failed to send scheduled PDF report '{report.name}': {str(e)}")
-                # Continue with other reports even if one fails
-                continue
+        """Cron job to send scheduled reports, each one as an independent job (odash.pdf.report.job)"""
+        jobs = self.env['odash.pdf.report.job']
+        jobs.enqueue_due_reports()
+        self.env.cr.commit()
+        jobs.process_jobs()
@@ -0,0 +1,209 @@
+import logging
+import time
+from datetime import datetime, timedelta
+
+from odoo import fields, models, api, _
+from odoo.tools import config
+
+_logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+# Delay before the first retry, doubled at each attempt
+RETRY_DELAY_MINUTES = 5
+DEFAULT_BATCH_SIZE = 20
+# Time (seconds) one job may take, and one run of the cron, at most
+DEFAULT_JOB_TIME_BUDGET = 300
+DEFAULT_CRON_TIME_BUDGET = 900
+# Finished jobs are kept this long
+JOB_RETENTION_DAYS = 30
+
+
+class OdashPdfReportJob(models.Model):
+    """
+    Sending of a scheduled PDF report, for one occurrence of its schedule.
+
+    The report cron creates a job for each due report, then runs the pending
+    jobs one transaction each (locked with SKIP LOCKED): a slow or failing report
+    no longer delays or rolls back the others, and a report sent is never sent
+    again because a later one crashed. Failed jobs are retried with an exponential
+    backoff, up to MAX_ATTEMPTS; the report then moves on to its next scheduled
+    date (last_failed_date). A run stops after a batch of jobs or when its
+    time budget is spent, below the real time limit of the cron workers, and
+    triggers the cron again for the remaining jobs.
+    """
+    _name = 'odash.pdf.report.job'
+    _description = 'Dashboard PDF Report Job'
+    _order = 'next_attempt_date, id'
+
+    report_id = fields.Many2one(comodel_name='odash.pdf.report', string='Report', required=True,
+                                ondelete='cascade', readonly=True)
+    scheduled_date = fields.Datetime(string='Scheduled Date', required=True, readonly=True)
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='State', required=True, default='pending', index=True, readonly=True)
+    attempt_count = fields.Integer(string='Attempts', default=0, readonly=True)
+    next_attempt_date = fields.Datetime(string='Next Attempt', default=fields.Datetime.now, index=True, readonly=True)
+    error_message = fields.Text(string='Last Error', readonly=True)
+    date_done = fields.Datetime(string='Done At', readonly=True)
+
+    _sql_constraints = [
+        ('report_scheduled_date_uniq', 'unique(report_id, scheduled_date)',
+         'A report is sent once per scheduled date.'),
+    ]
+
+    def _get_param(self, name, default):
+        return int(self.env['ir.config_parameter'].sudo().get_param(name, default))
+
+    @api.model
+    def _get_cron_time_budget(self):
+        """Return the time (seconds) one run of the cron may spend, within the cron time limit."""
+        budget = self._get_param('odashboard.pdf.cron_time_budget', DEFAULT_CRON_TIME_BUDGET)
+        limit = config.get('limit_time_real_cron') or -1
+        if limit <= 0:
+            limit = config.get('limit_time_real') or 0
+        if limit > 0:
+            budget = min(budget, limit * 0.8)
+        return budget
+
+    @api.model
+    def enqueue_due_reports(self):
+        """Create the jobs of the reports due, once per scheduled date."""
+        reports = self.env['odash.pdf.report'].search([
+            ('active', '=', True),
+            ('next_send_date', '<=', datetime.now()),
+        ])
+        if not reports:
+            return self.browse()
+        existing = {
+            (job.report_id.id, job.scheduled_date)
+            for job in self.search([('report_id', 'in', reports.ids)])
+        }
+        jobs = self.create([
+            {'report_id': report.id, 'scheduled_date': report.next_send_date}
+            for report in reports
+            if (report.id, report.next_send_date) not in existing
+        ])
+        _logger.info(f"Found {len(reports)} PDF reports to send, {len(jobs)} new jobs")
+        return jobs
+
+    @api.model
+    def process_jobs(self):
+        """
+        Run the pending jobs whose attempt is due, committing after each one, until
+        the batch size or the time budget of the run is reached.
+        """
+        cron_budget = self._get_cron_time_budget()
+        cron_deadline = time.monotonic() + cron_budget
+        job_budget = min(self._get_param('odashboard.pdf.job_time_budget', DEFAULT_JOB_TIME_BUDGET), cron_budget)
+        batch_size = self._get_param('odashboard.pdf.cron_batch_size', DEFAULT_BATCH_SIZE)
+
+        processed = 0
+        while processed < batch_size:
+            if time.monotonic() + job_budget > cron_deadline:
+                _logger.info("PDF report jobs: time budget of the run spent")
+                break
+            self.env.cr.execute("""
+                SELECT id FROM odash_pdf_report_job
+                WHERE state = 'pending' AND next_attempt_date <= (now() at time zone 'UTC')
+                ORDER BY next_attempt_date, id
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            """)
+            row = self.env.cr.fetchone()
+            if not row:
+                break
+            job = self.browse(row[0])
+            if job._claim():
+                job._run(time.monotonic() + job_budget)
+            processed += 1
+
+        self._schedule_next_run()
+        return processed
+
+    def _claim(self):
+        """
+        Count the attempt about to run and schedule its retry, then commit: an
+        attempt killed with its worker (time limit, crash) is counted as well and
+        retried after its backoff, never endlessly. Return whether the job may
+        run, False when the attempts are exhausted.
+        """
+        self.ensure_one()
+        if self.attempt_count >= MAX_ATTEMPTS:
+            self._give_up(self.error_message or _("The sending was interrupted"))
+            self.env.cr.commit()
+            return False
+        attempt_count = self.attempt_count + 1
+        self.write({
+            'attempt_count': attempt_count,
+            'next_attempt_date': fields.Datetime.now() + self._get_retry_delay(attempt_count),
+        })
+        self.env.cr.commit()
+        return True
+
+    @staticmethod
+    def _get_retry_delay(attempt_count):
+        return timedelta(minutes=RETRY_DELAY_MINUTES * 2 ** (attempt_count - 1))
+
+    def _run(self, deadline):
+        """Send the report of the job, before `deadline` (time.monotonic()), and commit."""
+        self.ensure_one()
+        report = self.report_id
+        try:
+            report.with_context(odash_pdf_deadline=deadline)._generate_and_send_report()
+            if time.monotonic() > deadline:
+                _logger.warning(f"PDF report '{report.name}' exceeded its time budget")
+            self.write({
+                'state': 'done',
+                'error_message': False,
+                'date_done': fields.Datetime.now(),
+            })
+            self.env.cr.commit()
+        except Exception as e:
+            # Forget the partial work (attachment, emails) of the failed attempt
+            self.env.cr.rollback()
+            self._register_failure(str(e))
+            self.env.cr.commit()
+
+    def _register_failure(self, error_message):
+        """Keep the retry scheduled by _claim(), or give up after MAX_ATTEMPTS."""
+        self.ensure_one()
+        if self.attempt_count >= MAX_ATTEMPTS:
+            self._give_up(error_message)
+            return
+        _logger.warning(f"Failed to send scheduled PDF report '{self.report_id.name}' "
+                        f"(attempt {self.attempt_count}), retrying in {self._get_retry_delay(self.attempt_count)}: "
+                        f"{error_message}")
+        self.write({'error_message': error_message})
+        self.report_id.write({
+            'last_execution_status': 'error',
+            'last_error_message': error_message,
+        })
+
+    def _give_up(self, error_message):
+        """Mark the job failed and move the report to its next scheduled date."""
+        self.ensure_one()
+        _logger.error(f"Failed to send scheduled PDF report '{self.report_id.name}' "
+                      f"after {self.attempt_count} attempts: {error_message}")
+        self.write({'state': 'failed', 'error_message': error_message, 'date_done': fields.Datetime.now()})
+        self.report_id.write({
+            'last_execution_status': 'error',
+            'last_error_message': error_message,
+            'last_failed_date': fields.Datetime.now(),
+        })
+        self.report_id.message_post(
+            body=_("The scheduled report could not be sent after %s attempts: %s") % (self.attempt_count, error_message))
+
+    @api.model
+    def _schedule_next_run(self):
+        """Trigger the cron for the next pending job, and forget the old finished jobs."""
+        self.search([
+            ('state', 'in', ('done', 'failed')),
+            ('date_done', '<', fields.Datetime.now() - timedelta(days=JOB_RETENTION_DAYS)),
+        ]).unlink()
+        next_job = self.search([('state', '=', 'pending')], limit=1)
+        if next_job:
+            cron = self.env.ref('odashboard.ir_cron_send_pdf_reports')
+            cron._trigger(at=max(next_job.next_attempt_date, fields.Datetime.now()))
+        self.env.cr.commit()
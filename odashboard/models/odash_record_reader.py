@@ -0,0 +1,374 @@
+import base64
+import binascii
+import json
+import logging
+from datetime import datetime
+
+from odoo import models, api, _
+from odoo.exceptions import UserError
+from odoo.osv import expression
+from odoo.tools import SQL
+
+from ..tools.serialization import json_default, json_dumps
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_CHUNK_SIZE = 5000
+DEFAULT_PAGE_SIZE = 80
+DEFAULT_CHANGES_SIZE = 500
+# Field types that can be used as keyset sort keys: stored scalar columns
+KEYSET_FIELD_TYPES = ('char', 'integer', 'float', 'monetary', 'date', 'datetime', 'boolean', 'selection')
+
+
+class OdashRecordReader(models.AbstractModel):
+    """
+    Read the records of a model with keyset pagination: each page continues
+    after the sort key (sort fields and id) of the last record read, instead
+    of skipping an offset, so that its cost does not depend on its position.
+
+    Pages are returned with an opaque cursor (next_cursor) to fetch the next
+    one, and large tables can be streamed in chunks with a bounded memory.
+    """
+    _name = 'odash.record.reader'
+    _description = 'Dashboard Record Reader'
+
+    # ---- Parameters ----
+
+    @api.model
+    def parse_read_parameters(self, model_name, parameters):
+        """
+        Validate the read parameters of `model_name` with the current user:
+        domain (list or JSON string), fields (list or comma-separated string),
+        search (text matched on the display name), order (stored fields, e.g.
+        "date desc, name"), limit, chunk_size and cursor.
+        Return them normalized, raise UserError if they are invalid.
+        """
+        if model_name not in self.env:
+            raise UserError(_("Unknown model: %s", model_name))
+        Model = self.env[model_name]
+        Model.check_access('read')
+
+        domain = parameters.get('domain') or []
+        fields = parameters.get('fields') or ['display_name']
+        try:
+            if isinstance(domain, str):
+                domain = json.loads(domain)
+            if isinstance(fields, str):
+                fields = json.loads(fields) if fields.startswith('[') else fields.split(',')
+            limit = int(parameters['limit']) if parameters.get('limit') else None
+            chunk_size = int(parameters.get('chunk_size') or DEFAULT_CHUNK_SIZE)
+        except (ValueError, TypeError) as e:
+            raise UserError(_("Invalid read parameters: %s", e))
+        if not isinstance(domain, list):
+            raise UserError(_("The domain must be a list"))
+        if parameters.get('search'):
+            domain = expression.AND([domain, [('display_name', 'ilike', parameters['search'])]])
+
+        fields = [field.strip() for field in fields if field.strip()]
+        unknown_fields = [field for field in fields if field not in Model._fields]
+        if unknown_fields:
+            raise UserError(_("Unknown fields on %(model)s: %(fields)s",
+                              model=model_name, fields=', '.join(unknown_fields)))
+        # Build the query once to validate the domain before anything is read
+        Model._search(domain)
+
+        keys = self._parse_order(Model, parameters.get('order'))
+        return {
+            'domain': domain,
+            'fields': fields,
+            'keys': keys,
+            'limit': limit,
+            'chunk_size': max(1, min(chunk_size, MAX_CHUNK_SIZE)),
+            'last_values': self._decode_cursor(parameters.get('cursor'), keys),
+        }
+
+    @api.model
+    def _parse_order(self, Model, order):
+        """
+        Return the sort keys [(field name, descending)] of an order specification,
+        always ending with id so that the key of a record is unique.
+        """
+        keys = []
+        for item in (order or '').split(','):
+            tokens = item.split()
+            if not tokens:
+                continue
+            if len(tokens) > 2 or (len(tokens) == 2 and tokens[1].lower() not in ('asc', 'desc')):
+                raise UserError(_("Invalid order: %s", order))
+            field = Model._fields.get(tokens[0])
+            if field is None or not Model.fields_get([field.name]):
+                raise UserError(_("Unknown field in order: %s", tokens[0]))
+            if field.name != 'id' and (not field.store or not field.column_type
+                                       or field.type not in KEYSET_FIELD_TYPES or field.translate):
+                raise UserError(_("Cannot paginate on field %s: only stored scalar fields are supported", field.name))
+            keys.append((field.name, len(tokens) == 2 and tokens[1].lower() == 'desc'))
+            if field.name == 'id':
+                break
+        if not keys or keys[-1][0] != 'id':
+            keys.append(('id', False))
+        return keys
+
+    # ---- Cursors ----
+
+    @api.model
+    def _encode_cursor(self, keys, values):
+        """Return the opaque cursor continuing after the record whose sort key is `values`."""
+        payload = json.dumps({'keys': keys, 'values': values}, default=json_default)
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    @api.model
+    def _decode_cursor(self, cursor, keys):
+        """Return the sort key values of a cursor, None for the first page."""
+        if not cursor:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            cursor_keys = [(name, desc) for name, desc in payload['keys']]
+            values = payload['values']
+        except (ValueError, TypeError, KeyError, AttributeError, binascii.Error):
+            raise UserError(_("Invalid cursor"))
+        if cursor_keys != keys or len(values) != len(keys):
+            raise UserError(_("The cursor does not match the requested order"))
+        return values
+
+    # ---- Reading ----
+
+    @api.model
+    def _keyset_condition(self, Model, query, keys, last_values):
+        """
+        Return the SQL condition selecting the records sorted after `last_values`.
+        Ascending keys sort NULL last and descending keys NULL first, as PostgreSQL.
+        """
+        conditions = []
+        equal = []
+        for (name, desc), value in zip(keys, last_values):
+            column = Model._field_to_sql(Model._table, name, query)
+            if value is None:
+                after = SQL("%s IS NOT NULL", column) if desc else None
+                equal_condition = SQL("%s IS NULL", column)
+            else:
+                after = SQL("%s < %s", column, value) if desc else SQL("(%s > %s OR %s IS NULL)", column, value, column)
+                equal_condition = SQL("%s = %s", column, value)
+            if after is not None:
+                conditions.append(SQL("(%s)", SQL(" AND ").join([*equal, after])))
+            equal.append(equal_condition)
+        if not conditions:
+            return SQL("FALSE")
+        return SQL("(%s)", SQL(" OR ").join(conditions))
+
+    @api.model
+    def _read_keyset_page(self, model_name, domain, fields, keys, last_values, limit):
+        """
+        Return (values of the records, sort key of the last one or None) for the
+        `limit` records of `model_name` matching `domain`, sorted by `keys`,
+        after the record whose sort key is `last_values` (from the start if None).
+        """
+        Model = self.env[model_name]
+        query = Model._search(domain)
+        columns = [Model._field_to_sql(Model._table, name, query) for name, _desc in keys]
+        if last_values is not None:
+            query.add_where(self._keyset_condition(Model, query, keys, last_values))
+        query.order = SQL(", ").join(
+            SQL("%s DESC NULLS FIRST", column) if desc else SQL("%s ASC NULLS LAST", column)
+            for column, (_name, desc) in zip(columns, keys)
+        )
+        query.limit = limit
+        rows = self.env.execute_query(query.select(*columns))
+        if not rows:
+            return [], None
+        ids = [row[-1] for row in rows]
+        return Model.browse(ids).read(fields), list(rows[-1])
+
+    @api.model
+    def read_page(self, model_name, parameters, default_fields=None):
+        """
+        Return one page of records: {'records': [...], 'next_cursor': cursor or None}.
+        Parameters are those of parse_read_parameters(); `limit` is the page size.
+        """
+        if default_fields and not parameters.get('fields'):
+            parameters = dict(parameters, fields=default_fields)
+        values = self.parse_read_parameters(model_name, parameters)
+        limit = max(1, min(values['limit'] or DEFAULT_PAGE_SIZE, MAX_CHUNK_SIZE))
+        records, last_values = self._read_keyset_page(
+            model_name, values['domain'], values['fields'], values['keys'], values['last_values'], limit)
+        next_cursor = None
+        if last_values is not None and len(records) == limit:
+            next_cursor = self._encode_cursor(values['keys'], last_values)
+        return {'records': records, 'next_cursor': next_cursor}
+
+    @api.model
+    def read_changes(self, model_name, parameters):
+        """
+        Return the changes of the records of `model_name` since the `since` cursor:
+        {
+            'records': values of the records created or modified since, matching the domain,
+            'removed': ids deleted since, or modified since and not matching the domain anymore,
+            'next_since': cursor to pass as `since` next time,
+            'has_more': whether more changes are pending (call again right away),
+            'reset': whether the cursor is too old and the client must reload everything,
+        }
+        Without `since`, all the matching records are returned (by pages of `limit`)
+        and nothing is removed. Modifications are followed in (write_date, id) order
+        and deletions with the tombstones of odash.change.tracker; when the version
+        of the model (odash.change.tracker) has not changed since a caught-up cursor,
+        nothing is scanned at all. Read in a transaction of its own, see
+        odash.change.tracker.get_safe_timestamp().
+        """
+        with self.env.registry.cursor() as cr:
+            env = self.env(cr=cr)
+            safe_until = env['odash.change.tracker'].get_safe_timestamp()
+            return env['odash.record.reader']._read_changes(model_name, parameters, safe_until)
+
+    @api.model
+    def _read_changes(self, model_name, parameters, safe_until):
+        values = self.parse_read_parameters(model_name, parameters)
+        Model = self.env[model_name]
+        if not Model._log_access:
+            raise UserError(_("Cannot follow the changes of %s: it has no write date", model_name))
+        tracker = self.env['odash.change.tracker']
+        # Changes and deletions are only logged for the models read by dashboards
+        tracker.watch_models([model_name])
+        version = tracker.get_versions([model_name])[model_name]
+        limit = max(1, min(values['limit'] or DEFAULT_CHANGES_SIZE, MAX_CHUNK_SIZE))
+
+        since = self._decode_since(parameters.get('since'))
+        reset = bool(since) and tracker.is_tombstone_expired(since['deleted'])
+        if reset:
+            since = None
+        if since and since['version'] is not None and since['version'] == version:
+            # Nothing created, written or unlinked since the cursor caught up
+            return {
+                'records': [],
+                'removed': [],
+                'next_since': self._encode_since(dict(since, deleted=max(since['deleted'], safe_until))),
+                'has_more': False,
+                'reset': False,
+            }
+
+        # Records matching the domain, changed after the cursor
+        query = Model._search(values['domain'])
+        write_date = Model._field_to_sql(Model._table, 'write_date', query)
+        record_id = Model._field_to_sql(Model._table, 'id', query)
+        query.add_where(SQL("%s IS NOT NULL", write_date))
+        if since:
+            query.add_where(SQL("(%s, %s) > (%s, %s)", write_date, record_id, since['write_date'], since['id']))
+        query.order = SQL("%s, %s", write_date, record_id)
+        query.limit = limit
+        rows = self.env.execute_query(query.select(record_id, write_date))
+        has_more = len(rows) == limit
+
+        removed = []
+        if since:
+            # Records changed in the same range that do not match the domain anymore,
+            # archived ones too
+            Changed = Model.with_context(active_test=False)
+            changed_query = Changed._search([])
+            changed_write_date = Changed._field_to_sql(Changed._table, 'write_date', changed_query)
+            changed_id = Changed._field_to_sql(Changed._table, 'id', changed_query)
+            changed_query.add_where(SQL("(%s, %s) > (%s, %s)", changed_write_date, changed_id,
+                                        since['write_date'], since['id']))
+            if has_more:
+                changed_query.add_where(SQL("(%s, %s) <= (%s, %s)", changed_write_date, changed_id,
+                                            rows[-1][1], rows[-1][0]))
+            changed_query.add_where(SQL("%s NOT IN (%s)", changed_id, Model._search(values['domain']).subselect()))
+            removed = [row[0] for row in self.env.execute_query(changed_query.select(changed_id))]
+            removed += tracker.get_deleted_ids(model_name, since['deleted'])
+
+        if rows:
+            position = {'write_date': rows[-1][1], 'id': rows[-1][0]}
+        elif since:
+            position = {'write_date': since['write_date'], 'id': since['id']}
+        else:
+            position = {'write_date': safe_until, 'id': 0}
+        if has_more:
+            deleted = since['deleted'] if since else safe_until
+            # More changes pending whatever the version
+            position_version = None
+        else:
+            # Caught up: come back before the transactions still in progress, their
+            # changes are stamped with their start (changes sent again are harmless)
+            deleted = safe_until
+            position_version = version
+            if position['write_date'] > safe_until:
+                position = {'write_date': safe_until, 'id': 0}
+
+        return {
+            'records': Model.browse([row[0] for row in rows]).read(values['fields']),
+            'removed': sorted(set(removed)),
+            'next_since': self._encode_since(dict(position, deleted=deleted, version=position_version)),
+            'has_more': has_more,
+            'reset': reset,
+        }
+
+    @api.model
+    def _encode_since(self, since):
+        payload = json.dumps(since, default=json_default)
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    @api.model
+    def _decode_since(self, since):
+        """Return the {'write_date', 'id', 'deleted', 'version'} of a change cursor, None if empty."""
+        if not since:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(since.encode('ascii')))
+            return {
+                'write_date': datetime.fromisoformat(payload['write_date']),
+                'id': int(payload['id']),
+                'deleted': datetime.fromisoformat(payload['deleted']),
+                'version': None if payload.get('version') is None else int(payload['version']),
+            }
+        except (ValueError, TypeError, KeyError, AttributeError, binascii.Error):
+            raise UserError(_("Invalid since cursor"))
+
+    @api.model
+    def iter_chunks(self, model_name, domain, fields, keys, chunk_size=DEFAULT_CHUNK_SIZE, limit=None,
+                    last_values=None):
+        """
+        Yield the values of the records of `model_name` matching `domain`, one
+        list of `chunk_size` dicts at a time, sorted by `keys`. The record cache
+        is emptied between chunks.
+        """
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            records, last_values = self._read_keyset_page(model_name, domain, fields, keys, last_values, size)
+            if not records:
+                break
+            yield records
+            if remaining is not None:
+                remaining -= len(records)
+            self.env.invalidate_all()
+            if len(records) < size:
+                break
+
+    @api.model
+    def stream_records(self, model_name, parameters):
+        """
+        Return a generator of NDJSON lines (bytes, one record per line) for the
+        records of `model_name` matching `parameters`, see parse_read_parameters().
+
+        Parameters are checked immediately, but records are only read while the
+        generator is consumed, that is after the controller returned and the
+        request cursor was closed: it reads them with its own cursor, as the
+        current user. An error while streaming ends the stream with an
+        {"error": ...} line.
+        """
+        values = self.parse_read_parameters(model_name, parameters)
+        registry, uid = self.env.registry, self.env.uid
+        context = {key: value for key, value in self.env.context.items() if not isinstance(value, models.BaseModel)}
+
+        def generate():
+            with registry.cursor() as cr:
+                env = api.Environment(cr, uid, context)
+                try:
+                    for rows in env['odash.record.reader'].iter_chunks(
+                            model_name, values['domain'], values['fields'], values['keys'],
+                            values['chunk_size'], values['limit'], values['last_values']):
+                        yield b''.join(json_dumps(row) + b'\n' for row in rows)
+                except Exception as e:
+                    _logger.exception("Error while streaming %s records: %s", model_name, e)
+                    yield json_dumps({'error': str(e)}) + b'\n'
+
+        return generate()
@@ -17,3 +17,19 @@ class OdashboardSecurityGroup(models.Model):
     def _compute_user_count(self):
         for record in self:
             record.user_count = len(record.user_ids)
+
+    def write(self, vals):
+        result = super().write(vals)
+        if 'user_ids' in vals:
+            self.env['odash.access.index'].refresh_groups(self.ids)
+        return result
+
+    def unlink(self):
+        access_index = self.env['odash.access.index']
+        pages = self.env['odash.config'].sudo().search([('security_group_ids', 'in', self.ids)])
+        categories = self.env['odash.category'].sudo().with_context(active_test=False).search(
+            [('security_group_ids', 'in', self.ids)])
+        result = super().unlink()
+        access_index.refresh_pages(pages.ids)
+        access_index.refresh_categories(categories.ids)
+        return result
@@ -0,0 +1,133 @@
+import json
+import logging
+import zlib
+
+from odoo import models, api
+
+from ..tools.serialization import json_default
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+# Minimum delay between two updates of the last access date of an entry
+TOUCH_INTERVAL = 60
+
+
+class OdashSharedCache(models.AbstractModel):
+    """
+    Cache shared by all the workers of the database, stored in an UNLOGGED
+    PostgreSQL table: cheap to write, not replicated, emptied after a crash.
+    Values are JSON-serializable objects, stored compressed.
+    Entries expire after their TTL and the table is kept below a size budget
+    by a cron (gc), evicting the least recently used entries first.
+    """
+    _name = 'odash.shared.cache'
+    _description = 'Dashboard Shared Cache'
+
+    def init(self):
+        self.env.cr.execute("""
+            CREATE UNLOGGED TABLE IF NOT EXISTS odash_shared_cache (
+                key varchar PRIMARY KEY,
+                value bytea NOT NULL,
+                size integer NOT NULL,
+                expires_at timestamp NOT NULL,
+                last_access timestamp NOT NULL DEFAULT (now() at time zone 'UTC')
+            )
+        """)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS odash_shared_cache_expires_at_idx
+            ON odash_shared_cache (expires_at)
+        """)
+
+    @api.model
+    def _get_default_ttl(self):
+        return int(self.env['ir.config_parameter'].sudo().get_param('odashboard.cache.ttl', DEFAULT_TTL))
+
+    @api.model
+    def get(self, key, fresh=False):
+        """
+        Return the value stored for `key`, or None if missing or expired.
+        With `fresh`, read in a new transaction to see entries committed after
+        the current transaction started.
+        """
+        query = """
+            SELECT value, last_access < (now() at time zone 'UTC') - %s * interval '1 second'
+            FROM odash_shared_cache
+            WHERE key = %s AND expires_at > (now() at time zone 'UTC')
+        """
+        if fresh:
+            with self.env.registry.cursor() as cr:
+                cr.execute(query, (TOUCH_INTERVAL, key))
+                row = cr.fetchone()
+        else:
+            self.env.cr.execute(query, (TOUCH_INTERVAL, key))
+            row = self.env.cr.fetchone()
+        if not row:
+            return None
+
+        value, touch = row
+        if touch:
+            with self.env.registry.cursor() as cr:
+                cr.execute("""
+                    UPDATE odash_shared_cache SET last_access = now() at time zone 'UTC' WHERE key = %s
+                """, (key,))
+        try:
+            return json.loads(zlib.decompress(bytes(value)))
+        except (zlib.error, ValueError) as e:
+            _logger.warning("Dropping unreadable shared cache entry %s: %s", key, e)
+            self.delete([key])
+            return None
+
+    @api.model
+    def set(self, key, value, ttl=None):
+        """
+        Store `value` for `key` during `ttl` seconds (odashboard.cache.ttl by default).
+        The entry is written and committed in its own transaction, so that other
+        workers see it immediately whatever happens to the current transaction.
+        """
+        ttl = self._get_default_ttl() if ttl is None else ttl
+        if not ttl:
+            return False
+        payload = zlib.compress(json.dumps(value, default=json_default).encode('utf-8'), 1)
+        try:
+            with self.env.registry.cursor() as cr:
+                cr.execute("""
+                    INSERT INTO odash_shared_cache (key, value, size, expires_at, last_access)
+                    VALUES (%s, %s, %s, (now() at time zone 'UTC') + %s * interval '1 second', now() at time zone 'UTC')
+                    ON CONFLICT (key) DO UPDATE
+                    SET value = EXCLUDED.value, size = EXCLUDED.size,
+                        expires_at = EXCLUDED.expires_at, last_access = EXCLUDED.last_access
+                """, (key, payload, len(payload), ttl))
+        except Exception as e:
+            # The cache is an optimization, never fail the request because of it
+            _logger.warning("Could not store shared cache entry %s: %s", key, e)
+            return False
+        return True
+
+    @api.model
+    def delete(self, keys):
+        """Remove the given keys from the cache."""
+        if not keys:
+            return
+        with self.env.registry.cursor() as cr:
+            cr.execute("DELETE FROM odash_shared_cache WHERE key IN %s", (tuple(keys),))
+
+    @api.model
+    def gc(self):
+        """Cron: remove expired entries, then evict the least recently used ones above the size budget."""
+        max_size = int(self.env['ir.config_parameter'].sudo().get_param(
+            'odashboard.shared_cache.max_size', DEFAULT_MAX_SIZE))
+
+        self.env.cr.execute("DELETE FROM odash_shared_cache WHERE expires_at <= now() at time zone 'UTC'")
+        expired = self.env.cr.rowcount
+        self.env.cr.execute("""
+            WITH ranked AS (
+                SELECT key, sum(size) OVER (ORDER BY last_access DESC, key) AS running_size
+                FROM odash_shared_cache
+            )
+            DELETE FROM odash_shared_cache cache
+            USING ranked
+            WHERE cache.key = ranked.key AND ranked.running_size > %s
+        """, (max_size,))
+        _logger.info("Shared cache cleaned: %s expired and %s evicted entries", expired, self.env.cr.rowcount)
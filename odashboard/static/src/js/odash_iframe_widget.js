@@ -1,7 +1,7 @@
 /** @odoo-module **/
 
 import {registry} from "@web/core/registry";
-import {Component, onMounted, onWillUnmount} from "@odoo/owl";
+import {Component, onMounted, onWillUnmount, useRef} from "@odoo/owl";
 import {useService} from "@web/core/utils/hooks";
 
 export class OdashboardIframeWidget extends Component {
@@ -14,22 +14,34 @@ export class OdashboardIframeWidget extends Component {
         const companiesParam = `&company_ids=${companyIds.join(",")}`;
 
         this.iframeSrc = baseUrl + companiesParam;
+        this.companyIds = companyIds;
+        this.iframeRef = useRef("iframe");
         // Services
         this.actionService = useService("action");
+        this.busService = useService("bus_service");
         this.orm = useService("orm");
 
         // Method to handle messages from iframe
         this.handleMessage = this.handleMessage.bind(this);
+        this.handleModelChanged = this.handleModelChanged.bind(this);
+
+        // Live updates of the records without company and of the active companies,
+        // received while the dashboard is open only
+        this.busChannels = ["odashboard", ...companyIds.map((companyId) => `odashboard_company_${companyId}`)];
 
         // Add event listener when component is mounted
         onMounted(() => {
             window.addEventListener("message", this.handleMessage, false);
+            this.busChannels.forEach((channel) => this.busService.addChannel(channel));
+            this.busService.subscribe("odashboard/model_changed", this.handleModelChanged);
             this.adjustIframePosition();
         });
 
         // Remove event listener when component is unmounted
         onWillUnmount(() => {
             window.removeEventListener("message", this.handleMessage, false);
+            this.busService.unsubscribe("odashboard/model_changed", this.handleModelChanged);
+            this.busChannels.forEach((channel) => this.busService.deleteChannel(channel));
         });
     }
 
@@ -67,7 +79,10 @@ export class OdashboardIframeWidget extends Component {
             if (message.type === "navigate") {
                 this.handleNavigation(message);
             } else if (message.type === "refresh") {
-                window.location.reload()
+                // Reload the dashboard only, not the whole web client
+                if (this.iframeRef.el) {
+                    this.iframeRef.el.src = this.iframeSrc;
+                }
             } else if (message.type === "openUrl") {
                 if (message.target === "_self") {
                     window.location.href = message.url
@@ -78,6 +93,26 @@ export class OdashboardIframeWidget extends Component {
         }
     }
 
+    /**
+     * Relay the live updates pushed on the bus to the dashboard app, which
+     * refetches only the widgets reading the changed models.
+     * @param {Object} payload - {changes: [{model, company_ids}]}, empty company_ids meaning any company
+     */
+    handleModelChanged(payload) {
+        const iframe = this.iframeRef.el;
+        if (!iframe || !iframe.contentWindow) {
+            return;
+        }
+        const changes = (payload.changes || []).filter(
+            (change) => !change.company_ids.length
+                || change.company_ids.some((companyId) => this.companyIds.includes(companyId))
+        );
+        if (changes.length) {
+            const targetOrigin = new URL(this.iframeSrc, window.location.href).origin;
+            iframe.contentWindow.postMessage({type: "modelChanged", changes}, targetOrigin);
+        }
+    }
+
     /**
      * Handle navigation requests from iframe
      * @param {Object} message - The navigation message
@@ -0,0 +1 @@
+from . import test_json_patch
@@ -0,0 +1,58 @@
+from odoo.tests import BaseCase
+
+from ..tools.json_patch import JsonPatchError, JsonPatchTestFailed, apply_patch, json_equal
+
+
+class TestJsonPatch(BaseCase):
+
+    def test_add_replace_remove(self):
+        document = {'title': 'Sales', 'widgets': [{'id': 'a'}]}
+        patched = apply_patch(document, [
+            {'op': 'add', 'path': '/widgets/-', 'value': {'id': 'b'}},
+            {'op': 'replace', 'path': '/title', 'value': 'Revenue'},
+            {'op': 'remove', 'path': '/widgets/0'},
+        ])
+        self.assertEqual(patched, {'title': 'Revenue', 'widgets': [{'id': 'b'}]})
+        # The patch is applied to a copy
+        self.assertEqual(document, {'title': 'Sales', 'widgets': [{'id': 'a'}]})
+
+    def test_failed_operation_is_atomic(self):
+        document = {'title': 'Sales'}
+        with self.assertRaises(JsonPatchError):
+            apply_patch(document, [
+                {'op': 'replace', 'path': '/title', 'value': 'Revenue'},
+                {'op': 'remove', 'path': '/missing'},
+            ])
+        self.assertEqual(document, {'title': 'Sales'})
+
+    def test_test_operation(self):
+        document = {'count': 1, 'ratio': 0.5, 'visible': True, 'filters': {'state': ['done']}, 'note': None}
+        operations = [
+            {'op': 'test', 'path': '/count', 'value': 1},
+            {'op': 'test', 'path': '/ratio', 'value': 0.5},
+            {'op': 'test', 'path': '/visible', 'value': True},
+            {'op': 'test', 'path': '/filters', 'value': {'state': ['done']}},
+            {'op': 'test', 'path': '/note', 'value': None},
+        ]
+        self.assertEqual(apply_patch(document, operations), document)
+
+    def test_test_operation_type_mismatch(self):
+        document = {'count': 1, 'ratio': 1.0, 'visible': True, 'empty': 0, 'items': [1], 'label': '1'}
+        for path, value in [
+            ('/count', True),
+            ('/visible', 1),
+            ('/count', 1.0),
+            ('/ratio', 1),
+            ('/empty', False),
+            ('/empty', None),
+            ('/items', [True]),
+            ('/label', 1),
+        ]:
+            with self.subTest(path=path, value=value), self.assertRaises(JsonPatchTestFailed):
+                apply_patch(document, [{'op': 'test', 'path': path, 'value': value}])
+
+    def test_json_equal(self):
+        self.assertTrue(json_equal({'a': [1, {'b': False}]}, {'a': [1, {'b': False}]}))
+        self.assertFalse(json_equal({'a': [1, {'b': False}]}, {'a': [1, {'b': 0}]}))
+        self.assertFalse(json_equal({'a': 1}, {'a': 1, 'b': 2}))
+        self.assertFalse(json_equal([1, 2], [1, 2, 3]))
@@ -0,0 +1,4 @@
+from . import cache
+from . import serialization
+from . import single_flight
+from . import json_patch
@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU cache with a per-entry TTL and a total size budget.
+
+    The size of each entry is given when it is stored (defaults to 1, which makes
+    `max_size` a number of entries). Least recently used entries are evicted once
+    the budget is exceeded; expired entries are dropped when they are looked up.
+    """
+
+    def __init__(self, max_size=1024, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, max_size=None, ttl=None):
+        """Update the size budget and default TTL, evicting entries if needed."""
+        with self._lock:
+            if max_size is not None:
+                self.max_size = max_size
+            if ttl is not None:
+                self.ttl = ttl
+            self._evict()
+
+    def get(self, key, default=None):
+        """Return the value stored for `key`, or `default` if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, size=1, ttl=None):
+        """Store `value` for `key`; values bigger than the whole budget are not stored."""
+        ttl = self.ttl if ttl is None else ttl
+        if size > self.max_size:
+            return False
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            expires_at = time.monotonic() + ttl if ttl else None
+            self._entries[key] = (value, size, expires_at)
+            self.size += size
+            self._evict()
+        return True
+
+    def pop(self, key, default=None):
+        """Remove `key` from the cache and return its value."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._remove(key)
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        _value, size, _expires_at = self._entries.pop(key)
+        self.size -= size
+
+    def _evict(self):
+        while self._entries and self.size > self.max_size:
+            _key, (_value, size, _expires_at) = self._entries.popitem(last=False)
+            self.size -= size
@@ -0,0 +1,146 @@
+import copy
+
+OPERATIONS = ('add', 'remove', 'replace', 'move', 'copy', 'test')
+
+
+class JsonPatchError(ValueError):
+    """The patch is malformed or cannot be applied to the document."""
+
+
+class JsonPatchTestFailed(JsonPatchError):
+    """A `test` operation of the patch did not match the document."""
+
+
+def parse_pointer(pointer):
+    """Return the unescaped tokens of a JSON pointer (RFC 6901)."""
+    if not isinstance(pointer, str) or (pointer and not pointer.startswith('/')):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    if not pointer:
+        return []
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+def _list_index(container, token, allow_end=False):
+    if allow_end and token == '-':
+        return len(container)
+    if not token.isdigit() or (token != '0' and token.startswith('0')):
+        raise JsonPatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f"Array index out of range: {token}")
+    return index
+
+
+def _child(container, token):
+    if isinstance(container, dict):
+        if token not in container:
+            raise JsonPatchError(f"Missing member: {token!r}")
+        return container[token]
+    if isinstance(container, list):
+        return container[_list_index(container, token)]
+    raise JsonPatchError(f"Cannot resolve {token!r} in a scalar value")
+
+
+def resolve_pointer(document, pointer):
+    """Return the value of `document` at `pointer`."""
+    value = document
+    for token in parse_pointer(pointer):
+        value = _child(value, token)
+    return value
+
+
+def _parent(document, pointer):
+    tokens = parse_pointer(pointer)
+    if not tokens:
+        return None, None
+    parent = document
+    for token in tokens[:-1]:
+        parent = _child(parent, token)
+    if not isinstance(parent, (dict, list)):
+        raise JsonPatchError(f"Cannot resolve {pointer!r} in a scalar value")
+    return parent, tokens[-1]
+
+
+def _add(document, pointer, value):
+    parent, token = _parent(document, pointer)
+    if parent is None:
+        return value
+    if isinstance(parent, dict):
+        parent[token] = value
+    else:
+        parent.insert(_list_index(parent, token, allow_end=True), value)
+    return document
+
+
+def _remove(document, pointer):
+    parent, token = _parent(document, pointer)
+    if parent is None:
+        raise JsonPatchError("Cannot remove the whole document")
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Missing member: {token!r}")
+        return parent.pop(token)
+    return parent.pop(_list_index(parent, token))
+
+
+def json_equal(left, right):
+    """
+    Return whether two JSON values are equal (RFC 6902 `test`): of the same type,
+    booleans being neither integers nor floats, and with equal values, members
+    and items.
+    """
+    if type(left) is not type(right):
+        return False
+    if isinstance(left, dict):
+        return left.keys() == right.keys() and all(json_equal(value, right[key]) for key, value in left.items())
+    if isinstance(left, list):
+        return len(left) == len(right) and all(map(json_equal, left, right))
+    return left == right
+
+
+def is_prefix(pointer, path):
+    """Return whether `path` is `pointer` or one of its descendants."""
+    return path == pointer or path.startswith(pointer + '/')
+
+
+def apply_patch(document, operations):
+    """
+    Apply the JSON Patch `operations` (RFC 6902) to `document` and return the
+    patched document. The patch is atomic: `document` is never modified, and
+    JsonPatchError is raised if any operation fails.
+    """
+    if not isinstance(operations, list):
+        raise JsonPatchError("A JSON Patch must be an array of operations")
+    document = copy.deepcopy(document)
+    for operation in operations:
+        if not isinstance(operation, dict) or operation.get('op') not in OPERATIONS:
+            raise JsonPatchError(f"Invalid operation: {operation!r}")
+        op, path = operation['op'], operation.get('path')
+        if op in ('add', 'replace', 'test') and 'value' not in operation:
+            raise JsonPatchError(f"Missing value in {op} operation")
+        if op in ('move', 'copy') and 'from' not in operation:
+            raise JsonPatchError(f"Missing from in {op} operation")
+
+        if op == 'add':
+            document = _add(document, path, copy.deepcopy(operation['value']))
+        elif op == 'remove':
+            _remove(document, path)
+        elif op == 'replace':
+            if not parse_pointer(path):
+                document = copy.deepcopy(operation['value'])
+            else:
+                resolve_pointer(document, path)
+                _remove(document, path)
+                document = _add(document, path, copy.deepcopy(operation['value']))
+        elif op == 'move':
+            source = operation['from']
+            if source != path and is_prefix(source, path):
+                raise JsonPatchError(f"Cannot move {source!r} into one of its children")
+            if source != path:
+                document = _add(document, path, _remove(document, source))
+        elif op == 'copy':
+            document = _add(document, path, copy.deepcopy(resolve_pointer(document, operation['from'])))
+        elif op == 'test':
+            if not json_equal(resolve_pointer(document, path), operation['value']):
+                raise JsonPatchTestFailed(f"Test failed at {path!r}")
+    return document
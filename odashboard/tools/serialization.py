@@ -0,0 +1,53 @@
+import gzip
+import json
+from datetime import datetime, date
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+COMPRESS_MIN_SIZE = 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+
+def json_default(value):
+    """`default` hook of json.dumps: ISO format for dates, str() for anything else."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def json_dumps(value):
+    """
+    Serialize `value` to JSON bytes, with orjson when it is installed
+    (dates are natively written in ISO format) and the stdlib otherwise.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Not supported by orjson (e.g. integers above 64 bits)
+            pass
+    return json.dumps(value, default=json_default).encode('utf-8')
+
+
+def compression_encodings():
+    """Return the supported content encodings, by order of preference."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def compress(body, encoding):
+    """Compress `body` (bytes) with the given content encoding ('br' or 'gzip')."""
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
@@ -0,0 +1,47 @@
+import threading
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'shared')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.shared = False
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls sharing the same key within the process:
+    the first thread computes the result, the others wait for it and reuse it.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, compute, timeout, shareable=None):
+        """
+        Return `(result, shared)`: `shared` is True when the result was computed
+        by another thread. Waiting threads compute the result themselves when the
+        leading call fails, times out, or returns a result rejected by `shareable`.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if call.event.wait(timeout) and call.shared:
+                return call.result, True
+            return compute(), False
+
+        try:
+            call.result = compute()
+            call.shared = shareable is None or bool(shareable(call.result))
+            return call.result, False
+        finally:
+            call.event.set()
+            with self._lock:
+                del self._calls[key]